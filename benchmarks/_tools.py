@@ -0,0 +1,68 @@
+import asyncio
+import gc
+import tracemalloc
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+
+def measure(fn: Callable[[], Any], number: int = 20) -> tuple[float, int]:
+    """
+    Measure the mean run time of the function and the peak memory of a single run.
+
+    Returns:
+        (mean time in seconds, peak allocated bytes)
+    """
+    fn()  # warm up the caches and the lazy pydantic builds
+
+    gc.collect()
+    start = perf_counter()
+    for _ in range(number):
+        fn()
+    mean_time = (perf_counter() - start) / number
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return mean_time, peak
+
+
+def print_table(headers: list[str], rows: list[list[Any]]):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    for row in [headers, *rows]:
+        print("  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)))
+
+
+def measure_async(
+    fn: Callable[[], Awaitable[Any]], number: int = 20
+) -> tuple[float, int]:
+    """
+    `measure` for the coroutine functions, all the runs share one event loop.
+    """
+    return asyncio.run(_measure_async(fn, number))
+
+
+async def _measure_async(
+    fn: Callable[[], Awaitable[Any]], number: int
+) -> tuple[float, int]:
+    await fn()
+
+    gc.collect()
+    start = perf_counter()
+    for _ in range(number):
+        await fn()
+    mean_time = (perf_counter() - start) / number
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return mean_time, peak
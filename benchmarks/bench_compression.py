@@ -0,0 +1,63 @@
+"""
+Measure the CPU cost of the response compression versus the bytes it saves,
+to pick `CompressionConfig.min_size` and `CompressionConfig.level`.
+
+Run: python -m benchmarks.bench_compression
+"""
+
+from uuid import uuid4
+
+from benchmarks._tools import measure, print_table
+from lambda_api.compression import compress
+from lambda_api.utils import json_dumps_bytes
+
+
+def make_payload(size: int) -> bytes:
+    items = []
+    payload = b"[]"
+    while len(payload) < size:
+        items.append(
+            {
+                "id": str(uuid4()),
+                "name": f"item {len(items)}",
+                "status": "active",
+                "price": len(items) * 1.25,
+                "tags": ["tag-a", "tag-b"],
+            }
+        )
+        payload = json_dumps_bytes(items)
+    return payload
+
+
+def main():
+    rows = []
+    for size in (512, 1024, 4096, 16384, 65536, 262144, 1048576):
+        payload = make_payload(size)
+
+        for encoding in ("gzip", "deflate"):
+            for level in (1, 6, 9):
+                compressed = compress(payload, encoding, level)
+                mean_time, _ = measure(
+                    lambda: compress(payload, encoding, level),
+                    number=max(5, 2_000_000 // len(payload)),
+                )
+                saved = len(payload) - len(compressed)
+
+                rows.append(
+                    [
+                        len(payload),
+                        encoding,
+                        level,
+                        f"{len(compressed) / len(payload):.1%}",
+                        f"{mean_time * 1e6:.0f}",
+                        f"{saved / 1024 / (mean_time * 1000):.1f}",
+                    ]
+                )
+
+    print_table(
+        ["bytes", "encoding", "level", "ratio", "cpu us", "KB saved / cpu ms"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Measure the per-invocation overhead of the sync Lambda entrypoints:
+a new event loop per event (`asyncio.run`) versus the persistent one (`handler`).
+
+Run: python -m benchmarks.bench_event_loop
+"""
+
+import asyncio
+
+from benchmarks._tools import measure, print_table
+from lambda_api.adapters import AWSAdapter, get_event_loop
+from lambda_api.app import LambdaAPI
+
+
+def main():
+    app = LambdaAPI()
+
+    @app.get("/ping")
+    async def ping() -> str:
+        return "pong"
+
+    adapter = AWSAdapter(app)
+    event = {"httpMethod": "GET", "pathParameters": {"proxy": "/ping"}}
+
+    asyncio_adapter = AWSAdapter(app)
+    asyncio_adapter.use_uvloop = False
+
+    cases = {
+        "asyncio.run": lambda: asyncio.run(adapter.run(event)),
+        "handler": lambda: asyncio_adapter.handler(event),
+    }
+    try:
+        import uvloop  # noqa: F401
+
+        cases["handler (uvloop)"] = lambda: adapter.handler(event)
+    except ImportError:
+        pass
+
+    rows = []
+    for name, fn in cases.items():
+        # the persistent loop is created by the next handler call
+        get_event_loop().close()
+        mean_time, peak = measure(fn, number=2000)
+        rows.append([name, f"{mean_time * 1e6:.1f}", peak])
+
+    print_table(["entrypoint", "us / event", "peak bytes"], rows)
+
+
+if __name__ == "__main__":
+    main()
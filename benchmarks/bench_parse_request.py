@@ -0,0 +1,76 @@
+"""
+Measure AWSAdapter.parse_request at varying header counts,
+comparing the eager header normalization with the lazy view.
+
+Run: python -m benchmarks.bench_parse_request
+"""
+
+from typing import Any
+
+from benchmarks._tools import measure, print_table
+from lambda_api.adapters import AWSAdapter
+from lambda_api.app import LambdaAPI, ParsedRequest
+from lambda_api.schema import Method
+
+
+def eager_parse_request(event: dict[str, Any]) -> ParsedRequest:
+    """The previous implementation, for the comparison"""
+    original_path = event.get("pathParameters", {}).get("proxy", "")
+    path = "/" + original_path.strip("/") if original_path else ""
+
+    singular_params = event.get("queryStringParameters") or {}
+    params = dict(event.get("multiValueQueryStringParameters") or {})
+    params.update(singular_params)
+
+    headers = event.get("headers") or {}
+    headers = {k.lower().replace("-", "_"): v for k, v in headers.items()}
+
+    return ParsedRequest(
+        headers=headers,
+        path=path,
+        method=Method(event["httpMethod"]),
+        params=params,
+        body={},
+        provider_data=event,
+        raw_body=event.get("body") or None,
+    )
+
+
+def make_event(header_count: int) -> dict[str, Any]:
+    return {
+        "httpMethod": "GET",
+        "pathParameters": {"proxy": "/example"},
+        "queryStringParameters": {"name": "test"},
+        "multiValueQueryStringParameters": {"name": ["test"]},
+        "headers": {f"X-Header-Number-{i}": f"value {i}" for i in range(header_count)},
+    }
+
+
+def main():
+    adapter = AWSAdapter(LambdaAPI())
+    rows = []
+
+    for header_count in (0, 10, 40, 100):
+        event = make_event(header_count)
+
+        eager_time, _ = measure(lambda: eager_parse_request(event), number=20000)
+        lazy_time, _ = measure(lambda: adapter.parse_request(event), number=20000)
+        lazy_read_time, _ = measure(
+            lambda: adapter.parse_request(event).headers.get("x_header_number_0"),
+            number=20000,
+        )
+
+        rows.append(
+            [
+                header_count,
+                f"{eager_time * 1e6:.2f}",
+                f"{lazy_time * 1e6:.2f}",
+                f"{lazy_read_time * 1e6:.2f}",
+            ]
+        )
+
+    print_table(["headers", "eager us", "lazy us", "lazy + read us"], rows)
+
+
+if __name__ == "__main__":
+    main()
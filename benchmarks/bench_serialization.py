@@ -0,0 +1,78 @@
+"""
+Compare the response serialization via python dicts with the single pass to JSON bytes.
+
+Run: python -m benchmarks.bench_serialization
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+from pydantic import BaseModel, RootModel
+
+from benchmarks._tools import measure, print_table
+from lambda_api.utils import json_dumps
+
+
+class Item(BaseModel):
+    id: str
+    name: str
+    description: str
+    price: float
+    tags: list[str]
+    created_at: datetime
+
+
+ItemList = RootModel[list[Item]]
+
+
+def make_items(count: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid4()),
+            "name": f"item {i}",
+            "description": "Some description of the item " * 3,
+            "price": i * 1.5,
+            "tags": ["tag-a", "tag-b", "tag-c"],
+            "created_at": datetime(2024, 1, 1, 12, 30),
+        }
+        for i in range(count)
+    ]
+
+
+def via_dict(data: list[dict]) -> str:
+    """The previous pipeline: validate -> dump to dicts -> orjson -> str"""
+    return json_dumps(ItemList.model_validate(data).model_dump(mode="json"))
+
+
+def single_pass(data: list[dict]) -> bytes:
+    """The current pipeline: validate -> dump straight to JSON bytes"""
+    model = ItemList.model_validate(data)
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def main():
+    rows = []
+    for count in (100, 1000, 4000):
+        data = make_items(count)
+        size = len(single_pass(data))
+
+        old_time, old_peak = measure(lambda: via_dict(data))
+        new_time, new_peak = measure(lambda: single_pass(data))
+
+        rows.append(
+            [
+                f"{size / 1024:.0f} KB",
+                f"{old_time * 1000:.2f}",
+                f"{new_time * 1000:.2f}",
+                f"{old_peak / 1024:.0f}",
+                f"{new_peak / 1024:.0f}",
+            ]
+        )
+
+    print_table(
+        ["payload", "dict ms", "bytes ms", "dict peak KB", "bytes peak KB"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
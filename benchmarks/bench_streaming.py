@@ -0,0 +1,98 @@
+"""
+Compare an export endpoint returning the whole list with the one streaming
+the items: the time to the first byte, the total time and the peak memory.
+
+Run: python -m benchmarks.bench_streaming
+"""
+
+from time import perf_counter
+from typing import AsyncIterator
+
+from pydantic import BaseModel
+
+from benchmarks._tools import measure_async, print_table
+from lambda_api.adapters import HTTPApiV2Adapter
+from lambda_api.app import LambdaAPI
+from lambda_api.streaming import ResponseStream
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    description: str
+
+
+class ExportParams(BaseModel):
+    count: int
+
+
+def make_item(i: int) -> dict:
+    return {"id": i, "name": f"item {i}", "description": "x" * 200}
+
+
+class TimedStream(ResponseStream):
+    """
+    Drops the written chunks, keeping the time of the first body chunk.
+    """
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.first_byte: float | None = None
+        self.writes = 0
+
+    async def write(self, data: bytes):
+        self.writes += 1
+        # the first write is the prelude
+        if self.writes == 2:
+            self.first_byte = perf_counter() - self.start
+
+    async def close(self): ...
+
+
+def main():
+    app = LambdaAPI()
+
+    @app.get("/list")
+    async def export_list(params: ExportParams) -> list[Item]:
+        return [make_item(i) for i in range(params.count)]
+
+    @app.get("/stream")
+    async def export_stream(params: ExportParams) -> AsyncIterator[Item]:
+        for i in range(params.count):
+            yield make_item(i)
+
+    adapter = HTTPApiV2Adapter(app)
+
+    rows = []
+    for count in (100, 10000):
+        for path in ("/list", "/stream"):
+            event = {
+                "rawPath": path,
+                "rawQueryString": f"count={count}",
+                "requestContext": {"http": {"method": "GET"}},
+            }
+            streams: list[TimedStream] = []
+
+            async def run():
+                streams.append(stream := TimedStream())
+                await adapter.run_streaming(event, None, stream)
+
+            mean_time, peak = measure_async(run, number=max(3, 20000 // count))
+            # skip the warm up and the memory tracing runs
+            timed = streams[1:-1]
+            first_byte = sum(stream.first_byte or 0 for stream in timed) / len(timed)
+            rows.append(
+                [
+                    count,
+                    path,
+                    f"{first_byte * 1000:.2f}",
+                    f"{mean_time * 1000:.2f}",
+                    f"{peak / 1024:.0f}",
+                ]
+            )
+
+    print_table(["items", "route", "first byte ms", "total ms", "peak KB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the validation error encodings: the former `e.json()` embedded into
+the response JSON versus `encode_validation_error` with its limits.
+
+Run: python -m benchmarks.bench_validation_errors
+"""
+
+from pydantic import BaseModel, ValidationError
+
+from benchmarks._tools import measure, print_table
+from lambda_api.utils import json_dumps_bytes
+from lambda_api.validation import ValidationErrorConfig, encode_validation_error
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class Body(BaseModel):
+    items: list[Item]
+
+
+def make_error(count: int) -> ValidationError:
+    try:
+        Body.model_validate({"items": [{"id": "x" * 100}] * count})
+    except ValidationError as e:
+        return e
+    raise AssertionError("The body must be invalid")
+
+
+def main():
+    encoders = {
+        "e.json() as a string": lambda e: json_dumps_bytes({"error": e.json()}),
+        "e.json() embedded": lambda e: f'{{"error": {e.json()}}}'.encode(),
+        "all errors": lambda e: encode_validation_error(
+            e, ValidationErrorConfig(max_errors=None)
+        ),
+        "default (20 errors)": lambda e: encode_validation_error(
+            e, ValidationErrorConfig()
+        ),
+        "20 errors, no input": lambda e: encode_validation_error(
+            e, ValidationErrorConfig(include_input=False)
+        ),
+    }
+
+    rows = []
+    for count in (1, 100, 1000):
+        error = make_error(count)
+        for name, encode in encoders.items():
+            mean_time, peak = measure(
+                lambda: encode(error), number=max(10, 2000 // count)
+            )
+            rows.append(
+                [
+                    error.error_count(),
+                    name,
+                    f"{mean_time * 1e6:.1f}",
+                    peak,
+                    len(encode(error)),
+                ]
+            )
+
+    print_table(["errors", "encoding", "us", "peak bytes", "body bytes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+End-to-end benchmarks of the request pipeline (`AWSAdapter.run`) and the docs generation.
+
+Run: python -m benchmarks.suite [--quick] [--filter NAME] [--save FILE]
+                                [--compare FILE] [--threshold 0.2]
+
+With `--compare`, the script exits with code 1 if any metric of any case
+is worse than in the baseline file by more than the threshold (a fraction).
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel
+
+from benchmarks._tools import measure, measure_async, print_table
+from lambda_api.adapters import AWSAdapter
+from lambda_api.app import LambdaAPI
+from lambda_api.docsgen import OpenApiGenerator
+from lambda_api.schema import Headers, Request
+from lambda_api.utils import json_dumps, json_loads
+
+
+class Params(BaseModel):
+    name: str
+    limit: int = 10
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    description: str
+    tags: list[str]
+
+
+class Body(BaseModel):
+    items: list[Item]
+
+
+class CustomHeaders(Headers):
+    x_request_id: str
+
+
+class CustomRequest(Request):
+    headers: CustomHeaders  # type: ignore
+
+
+def make_app(route_count: int) -> LambdaAPI:
+    """
+    Make the app with the given number of routes, a half of them with path parameters.
+    """
+    app = LambdaAPI(prefix="/api")
+
+    for i in range(route_count // 2):
+
+        @app.get(f"/static/{i}/items")
+        async def get_items(params: Params) -> list[str]:
+            return [params.name] * params.limit
+
+        @app.get(f"/users/{i}/{{user_id:int}}")
+        async def get_user(request: CustomRequest) -> str:
+            return request.headers.x_request_id
+
+    @app.post("/echo")
+    async def echo(body: Body) -> Body:
+        return body
+
+    app.compile()
+    return app
+
+
+def make_event(
+    method: str = "GET",
+    path: str = "/static/0/items",
+    params: dict[str, str] | None = None,
+    body: Any = None,
+    header_count: int = 0,
+) -> dict[str, Any]:
+    headers = {f"X-Header-{i}": f"value {i}" for i in range(header_count)}
+    headers["X-Request-Id"] = "request-id"
+
+    return {
+        "httpMethod": method,
+        "pathParameters": {"proxy": path},
+        "queryStringParameters": ({"name": "test"} if params is None else params),
+        "headers": headers,
+        "body": json_dumps(body) if body is not None else None,
+    }
+
+
+def make_body(size: int) -> dict[str, Any]:
+    item = {"id": 0, "name": "item", "description": "x" * 80, "tags": ["a", "b"]}
+    count = max(1, size // len(json_dumps(item)))
+    return {"items": [{**item, "id": i} for i in range(count)]}
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], tuple[float, int]]
+
+
+def pipeline_case(
+    name: str, app: LambdaAPI, event: dict[str, Any], number: int
+) -> Case:
+    adapter = AWSAdapter(app)
+
+    def run_event() -> Awaitable[Any]:
+        return adapter.run(event)
+
+    return Case(name, lambda: measure_async(run_event, number))
+
+
+def make_cases(quick: bool) -> list[Case]:
+    scale = 10 if quick else 1
+    apps = {count: make_app(count) for count in (10, 100, 1000, 5000)}
+    app = apps[100]
+    cases = []
+
+    for count, routes_app in apps.items():
+        cases += [
+            pipeline_case(
+                f"routes-{count}-static", routes_app, make_event(), 5000 // scale
+            ),
+            pipeline_case(
+                f"routes-{count}-path-params",
+                routes_app,
+                make_event(path=f"/users/{count // 2 - 1}/42"),
+                5000 // scale,
+            ),
+        ]
+
+    for size in (100, 10_000, 1_000_000, 5_000_000):
+        cases.append(
+            pipeline_case(
+                f"payload-{size}",
+                app,
+                make_event("POST", "/echo", body=make_body(size)),
+                max(3, 2_000_000 // size // scale),
+            )
+        )
+
+    for header_count in (0, 40):
+        cases.append(
+            pipeline_case(
+                f"headers-{header_count}",
+                app,
+                make_event(path="/users/0/1", header_count=header_count),
+                5000 // scale,
+            )
+        )
+
+    cases += [
+        pipeline_case(
+            "validation-error-params", app, make_event(params={}), 5000 // scale
+        ),
+        pipeline_case(
+            "validation-error-body",
+            app,
+            make_event("POST", "/echo", body={"items": [{"id": "x"}] * 100}),
+            1000 // scale,
+        ),
+        pipeline_case("not-found", app, make_event(path="/missing"), 5000 // scale),
+        pipeline_case("method-not-allowed", app, make_event("DELETE"), 5000 // scale),
+    ]
+
+    for count in (100, 1000):
+        cases.append(
+            Case(
+                f"openapi-{count}",
+                lambda count=count: measure(lambda: generate_schema(apps[count]), 3),
+            )
+        )
+
+    return cases
+
+
+def generate_schema(app: LambdaAPI) -> dict[str, Any]:
+    # measure the generation, not the cached document
+    app.schema_cache.clear()
+    return OpenApiGenerator(app).get_schema()
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(name, {}).get(metric)
+            if base and value > base * (1 + threshold):
+                regressions.append(
+                    f"{name} {metric}: {base:.2f} -> {value:.2f}"
+                    f" (+{(value / base - 1):.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations")
+    parser.add_argument("--filter", help="Run only the cases containing the string")
+    parser.add_argument("--save", type=Path, help="Save the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed regression as a fraction, 0.2 by default",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    rows = []
+    for case in make_cases(args.quick):
+        if args.filter and args.filter not in case.name:
+            continue
+
+        mean_time, peak = case.run()
+        results[case.name] = {"time_us": mean_time * 1e6, "peak_kb": peak / 1024}
+        rows.append([case.name, f"{mean_time * 1e6:.1f}", f"{peak / 1024:.1f}"])
+
+    print_table(["case", "time us", "peak KB"], rows)
+
+    if args.save:
+        args.save.write_text(json_dumps(results, indent=True))
+
+    if args.compare:
+        regressions = compare(
+            results, json_loads(args.compare.read_text()), args.threshold
+        )
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
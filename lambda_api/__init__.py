@@ -0,0 +1,47 @@
+"""
+Minimal Web API for lambdas.
+
+The public names are imported lazily on the first access, so importing the package
+doesn't load the modules (e.g. the docs generation) the app never uses.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "LambdaAPI": "lambda_api.app",
+    "CORSConfig": "lambda_api.app",
+    "CompileMode": "lambda_api.app",
+    "Router": "lambda_api.router",
+    "CompressionConfig": "lambda_api.compression",
+    "Depends": "lambda_api.depends",
+    "DependencyScope": "lambda_api.depends",
+    "Executor": "lambda_api.executors",
+    "RateLimit": "lambda_api.limits",
+    "ValidationErrorConfig": "lambda_api.validation",
+    "Method": "lambda_api.schema",
+    "Headers": "lambda_api.schema",
+    "Request": "lambda_api.schema",
+    "BearerAuthRequest": "lambda_api.schema",
+    "AWSAdapter": "lambda_api.adapters",
+    "HTTPApiV2Adapter": "lambda_api.adapters",
+    "ALBAdapter": "lambda_api.adapters",
+    "ASGIAdapter": "lambda_api.adapters",
+    "SQSAdapter": "lambda_api.adapters",
+    "OpenApiGenerator": "lambda_api.docsgen",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
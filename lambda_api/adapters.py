@@ -1,14 +1,59 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
-from typing import Any
-
-from orjson import JSONDecodeError
+from base64 import b64decode, b64encode
+from http import HTTPStatus
+from time import monotonic, perf_counter
+from typing import Any, Callable
 
 from lambda_api.app import LambdaAPI, ParsedRequest, Response
+from lambda_api.error import GatewayTimeoutError
 from lambda_api.schema import Method
-from lambda_api.utils import json_decode_error_fragment, json_dumps, json_loads
+from lambda_api.streaming import PRELUDE_DELIMITER, ResponseStream, close_stream
+from lambda_api.utils import (
+    LazyASGIHeaders,
+    LazyEncodedQueryParams,
+    LazyHeaders,
+    LazyMultiValueHeaders,
+    LazyQueryParams,
+    json_dumps,
+    json_dumps_bytes,
+    json_loads,
+)
+
+logger = logging.getLogger(__name__)
+
+_event_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_event_loop(use_uvloop: bool = True) -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop kept for the whole life of the process (i.e. the Lambda
+    container). uvloop is used if it's installed, unless disabled.
+    """
+    global _event_loop
+
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = _new_event_loop(use_uvloop)
+        asyncio.set_event_loop(_event_loop)
+
+    return _event_loop
+
+
+def _new_event_loop(use_uvloop: bool) -> asyncio.AbstractEventLoop:
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
 
 
 class BaseAdapter(ABC):
+    app: LambdaAPI
+
     @abstractmethod
     def __init__(self, app: LambdaAPI): ...
 
@@ -30,61 +75,566 @@ class BaseAdapter(ABC):
         Run the adapter with the given request data.
         """
 
+    @staticmethod
+    def encode_body_bytes(response: Response) -> bytes:
+        if not response.raw:
+            return json_dumps_bytes(response.body)
+        if isinstance(response.body, str):
+            return response.body.encode()
+        return response.body
+
+    @staticmethod
+    async def read_stream(response: Response) -> Response:
+        """
+        Read the whole streamed body, for the transports that can't stream.
+        """
+        try:
+            body = b"".join([chunk async for chunk in response.stream])  # type: ignore
+        except GatewayTimeoutError as e:
+            return Response(status=e.status, body={"error": str(e)})
+        except Exception as e:
+            logger.error("Streamed response failed", exc_info=e)
+            return Response(status=500, body={"error": "Internal Server Error"})
+        finally:
+            await close_stream(response.stream)  # type: ignore
+        return Response(response.status, body, headers=response.headers, raw=True)
+
+    def parse_request_timed(self, *args, **kwargs) -> ParsedRequest:
+        """
+        Parse the request, recording the parsing time if the app has the timing enabled.
+        """
+        if not self.app.timing_enabled:
+            return self.parse_request(*args, **kwargs)
+
+        start = perf_counter()
+        request = self.parse_request(*args, **kwargs)
+        request.timings = {"parse": perf_counter() - start}
+        return request
+
+
+class LambdaAdapter(BaseAdapter):
+    """
+    Shared core of the adapters for the AWS Lambda events.
+    """
+
+    use_uvloop = True
+    """Run the events on uvloop if it's installed."""
+    timeout_margin = 0.5
+    """
+    Seconds reserved before the end of the invocation to respond with 504,
+    instead of being killed by Lambda.
+    """
+
+    def get_deadline(self, context: Any) -> float | None:
+        """
+        Get the request deadline from the remaining time of the Lambda invocation.
+        """
+        if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+            return None
+        return (
+            monotonic()
+            + context.get_remaining_time_in_millis() / 1000
+            - self.timeout_margin
+        )
+
+    def handler(self, event: dict[str, Any], context: Any = None) -> Any:
+        """
+        Synchronous Lambda entrypoint, e.g. `handler = AWSAdapter(app).handler`.
+
+        Unlike `asyncio.run(adapter.run(event))`, the events run on one event loop
+        kept between the invocations, so the loop-bound clients (e.g. connection
+        pools) survive the warm starts.
+        """
+        return get_event_loop(self.use_uvloop).run_until_complete(
+            self.run(event, context)
+        )
+
+    def run_startup(self):
+        """
+        Run the app's startup hooks right away, e.g. at the module import,
+        so they run in the Lambda init phase instead of the first request.
+        """
+        get_event_loop(self.use_uvloop).run_until_complete(self.app.startup())
+
+
+class LambdaHTTPAdapter(LambdaAdapter):
+    """
+    Shared core of the adapters for the HTTP proxy events of AWS Lambda.
+    """
 
-class AWSAdapter(BaseAdapter):
     def __init__(self, app: LambdaAPI):
         self.app = app
 
+    @staticmethod
+    def normalize_path(path: str | None) -> str:
+        return "/" + path.strip("/") if path else ""
+
+    @staticmethod
+    def get_raw_body(event: dict[str, Any]) -> str | bytes | None:
+        """
+        Get the undecoded body, it's decoded by the app only if the endpoint needs it.
+        """
+        body = event.get("body")
+        if body and event.get("isBase64Encoded"):
+            return b64decode(body)
+        return body or None
+
+    def encode_body(self, response: Response) -> str:
+        if response.binary:
+            return b64encode(response.body).decode()
+        if not response.raw:
+            return json_dumps(response.body)
+        if isinstance(response.body, bytes):
+            return response.body.decode()
+        return response.body
+
+    def prepare_headers(self, response: Response) -> dict[str, str]:
+        return {"Content-Type": "application/json", **response.headers}
+
+    async def get_response(self, event: dict[str, Any], context: Any) -> Response:
+        if not self.app.started:
+            await self.app.startup()
+
+        deadline = self.get_deadline(context)
+        request = self.parse_request_timed(event)
+        request.deadline = deadline
+        return await self.app.run(request)
+
+    async def run(self, event: dict[str, Any], context: Any = None) -> dict[str, Any]:
+        response = await self.get_response(event, context)
+        if response.stream is not None:
+            response = await self.read_stream(response)
+        return self.prepare_response(response)
+
+    async def run_streaming(
+        self, event: dict[str, Any], context: Any, stream: ResponseStream
+    ):
+        """
+        Run the event in the Lambda response streaming mode: write the prelude
+        with the status and the headers, then the body chunks as they are produced.
+        See `LocalResponseStream` to run it locally.
+        """
+        response = await self.get_response(event, context)
+
+        prelude = {
+            "statusCode": response.status,
+            "headers": self.prepare_headers(response),
+        }
+        try:
+            await stream.write(json_dumps_bytes(prelude) + PRELUDE_DELIMITER)
+            if response.stream is None:
+                await stream.write(self.encode_body_bytes(response))
+            else:
+                async for chunk in response.stream:
+                    await stream.write(chunk)
+        except Exception as e:
+            # the status is sent already, the client gets the truncated body
+            logger.error("Streamed response failed", exc_info=e)
+        finally:
+            if response.stream is not None:
+                await close_stream(response.stream)
+            await stream.close()
+
+
+class AWSAdapter(LambdaHTTPAdapter):
+    """
+    Adapter for the API Gateway REST API proxy events (payload format 1.0).
+    """
+
     def parse_request(self, event: dict[str, Any]) -> ParsedRequest:
         """
         Parse the AWS Lambda event into a request dictionary.
         """
-        original_path = event.get("pathParameters", {}).get("proxy", "")
-        path = "/" + original_path.strip("/") if original_path else ""
-        method = Method(event["httpMethod"])
+        singular_params = event.get("queryStringParameters")
+        multi_params = event.get("multiValueQueryStringParameters")
+        if singular_params and multi_params:
+            # don't mutate the event, it's kept as the provider data
+            params = {**multi_params, **singular_params}
+        else:
+            params = singular_params or multi_params or {}
 
-        singular_params = event.get("queryStringParameters") or {}
-        params = event.get("multiValueQueryStringParameters") or {}
-        params.update(singular_params)
+        return ParsedRequest(
+            headers=LazyHeaders(event.get("headers") or {}),
+            path=self.normalize_path((event.get("pathParameters") or {}).get("proxy")),
+            method=Method(event["httpMethod"]),
+            params=params,
+            body={},
+            provider_data=event,
+            raw_body=self.get_raw_body(event),
+        )
 
-        body = event.get("body")
-        request_body = json_loads(body) if body else {}
+    def prepare_response(self, response: Response):
+        """
+        Prepare the response to be returned to the AWS Lambda handler.
+        """
+        result = {
+            "statusCode": response.status,
+            "body": self.encode_body(response),
+            "headers": self.prepare_headers(response),
+        }
+        if response.binary:
+            result["isBase64Encoded"] = True
+        return result
+
+
+class HTTPApiV2Adapter(LambdaHTTPAdapter):
+    """
+    Adapter for the API Gateway HTTP API events (payload format 2.0).
+    """
+
+    def parse_request(self, event: dict[str, Any]) -> ParsedRequest:
+        """
+        Parse the HTTP API event. The query string is parsed only when it's read.
+        The path is taken from the `proxy` path parameter if the route has it,
+        otherwise from the raw path.
+        """
+        proxy = (event.get("pathParameters") or {}).get("proxy")
 
         headers = event.get("headers") or {}
-        headers = {k.lower().replace("-", "_"): v for k, v in headers.items()}
+        if cookies := event.get("cookies"):
+            headers = {**headers, "cookie": "; ".join(cookies)}
 
         return ParsedRequest(
-            headers=headers,
-            path=path,
-            method=method,
-            params=params,
-            body=request_body,
+            headers=LazyHeaders(headers),
+            path=self.normalize_path(
+                proxy if proxy is not None else event.get("rawPath")
+            ),
+            method=Method(event["requestContext"]["http"]["method"]),
+            params=LazyQueryParams(event.get("rawQueryString") or ""),
+            body={},
             provider_data=event,
+            raw_body=self.get_raw_body(event),
         )
 
     def prepare_response(self, response: Response):
+        return {
+            "statusCode": response.status,
+            "body": self.encode_body(response),
+            "headers": self.prepare_headers(response),
+            "isBase64Encoded": response.binary,
+        }
+
+
+class ALBAdapter(LambdaHTTPAdapter):
+    def __init__(self, app: LambdaAPI, multi_value_headers: bool = False):
         """
-        Prepare the response to be returned to the AWS Lambda handler.
+        Adapter for the Application Load Balancer events.
+
+        Args:
+            app: The app to run the requests with.
+            multi_value_headers: Should match the target group's multi-value headers
+                setting, the events and the responses use `multiValueHeaders` then.
+        """
+        super().__init__(app)
+        self.multi_value_headers = multi_value_headers
+
+    def parse_request(self, event: dict[str, Any]) -> ParsedRequest:
         """
+        Parse the ALB event. ALB doesn't decode the query parameters,
+        so they are decoded only when they are read.
+        """
+        if self.multi_value_headers:
+            headers = LazyMultiValueHeaders(event.get("multiValueHeaders") or {})
+            params = event.get("multiValueQueryStringParameters")
+        else:
+            headers = LazyHeaders(event.get("headers") or {})
+            params = event.get("queryStringParameters")
+
+        return ParsedRequest(
+            headers=headers,
+            path=self.normalize_path(event.get("path")),
+            method=Method(event["httpMethod"]),
+            params=LazyEncodedQueryParams(params or {}),
+            body={},
+            provider_data=event,
+            raw_body=self.get_raw_body(event),
+        )
+
+    @staticmethod
+    def status_description(status: int) -> str:
+        try:
+            return f"{status} {HTTPStatus(status).phrase}"
+        except ValueError:
+            return str(status)
+
+    def prepare_response(self, response: Response):
+        headers = self.prepare_headers(response)
+
         return {
             "statusCode": response.status,
-            "body": response.body if response.raw else json_dumps(response.body),
-            "headers": {
-                "Content-Type": "application/json",
-                **response.headers,
-            },
+            "statusDescription": self.status_description(response.status),
+            "body": self.encode_body(response),
+            "isBase64Encoded": response.binary,
+            **(
+                {"multiValueHeaders": {k: [v] for k, v in headers.items()}}
+                if self.multi_value_headers
+                else {"headers": headers}
+            ),
         }
 
-    async def run(self, event: dict[str, Any], context: Any = None) -> dict[str, Any]:
-        request = None
+
+class ASGIAdapter(BaseAdapter):
+    def __init__(self, app: LambdaAPI, compile_on_startup: bool = True):
+        """
+        ASGI 3 application running the app under a long-lived server, e.g.
+        `uvicorn module:asgi_app`.
+
+        Args:
+            app: The app to run the requests with.
+            compile_on_startup: Build all the routes on the lifespan startup event,
+                so the requests never build them lazily.
+        """
+        self.app = app
+        self.compile_on_startup = compile_on_startup
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable):
+        await self.run(scope, receive, send)
+
+    def parse_request(self, event: dict[str, Any], body: bytes = b"") -> ParsedRequest:
+        """
+        Parse the ASGI HTTP scope and the received body into a request.
+        The headers and the query string are decoded only when they are read.
+        """
+        return ParsedRequest(
+            headers=LazyASGIHeaders(event["headers"]),
+            path="/" + event["path"].strip("/"),
+            method=Method(event["method"]),
+            params=LazyQueryParams(event.get("query_string", b"").decode("latin-1")),
+            body={},
+            provider_data=event,
+            raw_body=body or None,
+        )
+
+    def prepare_response(self, response: Response) -> list[dict[str, Any]]:
+        """
+        Prepare the ASGI messages to send the response.
+        """
+        return [
+            self.prepare_response_start(response),
+            {"type": "http.response.body", "body": self.encode_body_bytes(response)},
+        ]
+
+    def prepare_response_start(self, response: Response) -> dict[str, Any]:
+        headers = {"Content-Type": "application/json", **response.headers}
+        return {
+            "type": "http.response.start",
+            "status": response.status,
+            "headers": [
+                (k.lower().encode("latin-1"), v.encode("latin-1"))
+                for k, v in headers.items()
+            ],
+        }
+
+    async def send_stream(self, response: Response, send: Callable):
+        """
+        Send the streamed body chunk by chunk. If the stream fails, the error
+        is raised to the server, which drops the connection.
+        """
         try:
-            request = self.parse_request(event)
-        except JSONDecodeError as e:
-            return self.prepare_response(
-                Response(
-                    status=400,
-                    body={"error": "Invalid JSON:\n" + json_decode_error_fragment(e)},
+            await send(self.prepare_response_start(response))
+            async for chunk in response.stream:  # type: ignore
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
                 )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await close_stream(response.stream)  # type: ignore
+
+    async def run(self, scope: dict[str, Any], receive: Callable, send: Callable):
+        """
+        Handle the ASGI connection. Only the `http` and `lifespan` scopes are supported.
+
+        The route building is synchronous, so the concurrent requests can't race
+        on it even if the routes aren't compiled on startup.
+        """
+        if scope["type"] == "lifespan":
+            return await self.run_lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+        if not self.app.started:
+            # the server doesn't support the lifespan protocol
+            await self.app.startup()
+
+        body = await self.read_body(receive)
+        if body is None:
+            return  # the client is gone
+
+        try:
+            request = self.parse_request_timed(scope, body)
+        except ValueError:
+            response = Response(status=405, body={"error": "Method Not Allowed"})
+        else:
+            response = await self.app.run(request)
+
+        if response.stream is not None:
+            return await self.send_stream(response, send)
+        for message in self.prepare_response(response):
+            await send(message)
+
+    async def read_body(self, receive: Callable) -> bytes | None:
+        """
+        Receive the request body chunks until the end of the body.
+
+        Returns:
+            The body, or None if the client has disconnected.
+        """
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def run_lifespan(self, receive: Callable, send: Callable):
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                try:
+                    if self.compile_on_startup:
+                        self.app.compile()
+                    await self.app.startup()
+                except Exception as e:
+                    logger.error("Startup failed", exc_info=e)
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+
+            elif message["type"] == "lifespan.shutdown":
+                await self.app.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+class SQSAdapter(LambdaAdapter):
+    def __init__(
+        self,
+        app: LambdaAPI,
+        route_attribute: str | None = "route",
+        route_field: str | None = None,
+        method: Method = Method.POST,
+        concurrency: int = 10,
+    ):
+        """
+        Adapter for the SQS batch events. Each record is run as a separate request.
+
+        Args:
+            app: The app to run the records with.
+            route_attribute: Message attribute containing the route path.
+            route_field: Body field containing the route path,
+                used if the message has no route attribute.
+            method: The method of the route to run the records with.
+            concurrency: Maximum number of records processed at the same time.
+        """
+        self.app = app
+        self.route_attribute = route_attribute
+        self.route_field = route_field
+        self.method = method
+        self.concurrency = concurrency
+
+    def parse_request(self, event: dict[str, Any]) -> ParsedRequest:
+        """
+        Parse the SQS record into a request.
+        The message attributes are passed as the headers.
+        """
+        attributes = event.get("messageAttributes") or {}
+        raw_body = event.get("body") or None
+        body = {}
+
+        route = None
+        if self.route_attribute and self.route_attribute in attributes:
+            route = attributes[self.route_attribute].get("stringValue")
+        elif self.route_field and raw_body:
+            body = json_loads(raw_body)
+            raw_body = None
+            if isinstance(body, dict):
+                route = body.get(self.route_field)
+
+        return ParsedRequest(
+            headers=LazyHeaders(
+                {k: v.get("stringValue") for k, v in attributes.items()}
+            ),
+            path="/" + route.strip("/") if route else "",
+            method=self.method,
+            params={},
+            body=body,
+            provider_data=event,
+            raw_body=raw_body,
+        )
+
+    def prepare_response(self, response: Response) -> bool:
+        """
+        Check if the record was processed successfully.
+        Records failed with any error status are retried by SQS (or go to the DLQ).
+        """
+        return response.status < 400
+
+    async def run(self, event: dict[str, Any], context: Any = None) -> dict[str, Any]:
+        """
+        Process the records concurrently and report the failed ones,
+        so only they are retried.
+
+        The records of the same FIFO message group are processed in order,
+        and once one of them fails, the rest of the group is reported as failed too.
+        """
+        if not self.app.started:
+            await self.app.startup()
+
+        deadline = self.get_deadline(context)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        groups: dict[str, list[dict[str, Any]]] = {}
+        for record in event.get("Records") or []:
+            group_id = (record.get("attributes") or {}).get("MessageGroupId")
+            key = "group:" + group_id if group_id is not None else record["messageId"]
+            groups.setdefault(key, []).append(record)
+
+        results = await asyncio.gather(
+            *(
+                self._process_group(group, semaphore, deadline)
+                for group in groups.values()
             )
+        )
+
+        return {
+            "batchItemFailures": [
+                {"itemIdentifier": message_id}
+                for failed_ids in results
+                for message_id in failed_ids
+            ]
+        }
 
-        return self.prepare_response(await self.app.run(request))
+    async def _process_group(
+        self,
+        records: list[dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+        deadline: float | None,
+    ) -> list[str]:
+        for i, record in enumerate(records):
+            async with semaphore:
+                success = await self._process_record(record, deadline)
+
+            if not success:
+                return [r["messageId"] for r in records[i:]]
+
+        return []
+
+    async def _process_record(
+        self, record: dict[str, Any], deadline: float | None
+    ) -> bool:
+        try:
+            request = self.parse_request_timed(record)
+            request.deadline = deadline
+            response = await self.app.run(request)
+            if response.stream is not None:
+                response = await self.read_stream(response)
+            return self.prepare_response(response)
+        except Exception as e:
+            logger.error(
+                f"Failed to process the SQS message {record.get('messageId')}",
+                exc_info=e,
+            )
+            return False
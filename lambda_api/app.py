@@ -1,13 +1,60 @@
+import asyncio
 import logging
-from dataclasses import dataclass, field
-from inspect import _empty, signature
-from typing import Any, Callable, Iterable, Type
+from dataclasses import dataclass, field, replace
+from enum import StrEnum
+from functools import partial
+from inspect import (
+    _empty,
+    isasyncgenfunction,
+    isawaitable,
+    iscoroutinefunction,
+    signature,
+    unwrap,
+)
+from json.decoder import JSONDecodeError
+from os import PathLike
+from time import monotonic, perf_counter
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Mapping,
+    Type,
+    Unpack,
+    get_args,
+)
 
 from pydantic import BaseModel, RootModel, ValidationError
 
-from lambda_api.base import AbstractRouter, RouteParams
-from lambda_api.error import APIError
-from lambda_api.schema import Method, Request
+from lambda_api.base import AbstractRouter, Middleware, RouteParams
+from lambda_api.cache import ResponseCache
+from lambda_api.compression import CompressionConfig, compress, negotiate_encoding
+from lambda_api.depends import Container, DependencyGraph, Depends
+from lambda_api.error import (
+    APIError,
+    GatewayTimeoutError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
+)
+from lambda_api.executors import Executor, ExecutorPools
+from lambda_api.limits import RateLimiter
+from lambda_api.path_tree import PathTree, is_path_template, path_param_names
+from lambda_api.schema import Method, Request, make_request_loader
+from lambda_api.streaming import (
+    STREAM_CONTENT_TYPES,
+    BoundedStream,
+    StreamFormat,
+    encode_stream,
+)
+from lambda_api.utils import (
+    etag_matches,
+    json_decode_error_fragment,
+    json_loads,
+    make_etag,
+)
+from lambda_api.validation import ValidationErrorConfig, encode_validation_error
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +63,21 @@ logger = logging.getLogger(__name__)
 class Response:
     """
     Internal response type
+
+    If `raw` is set, the body is already encoded JSON (bytes or str)
+    and is passed to the client as is.
+    If `binary` is set, the body is encoded bytes (e.g. compressed)
+    and the text-only transports must base64 it.
+    If `stream` is set, the body is sent in the chunks it yields instead,
+    or read whole by the transports that can't stream.
     """
 
     status: int
     body: Any
     headers: dict[str, str] = field(default_factory=dict)
     raw: bool = False
+    binary: bool = False
+    stream: AsyncIterator[bytes] | None = None
 
 
 @dataclass(slots=True)
@@ -30,16 +86,50 @@ class ParsedRequest:
     Internal request type for the adapters
     """
 
-    headers: dict[str, str]
+    headers: Mapping[str, Any]
     path: str
     method: Method
-    params: dict[str, Any]
+    params: Mapping[str, Any]
     body: dict[str, Any]
     provider_data: dict[str, Any]
+    path_params: dict[str, Any] = field(default_factory=dict)
+    raw_body: str | bytes | None = None
+    """
+    Undecoded JSON body. Adapters set it instead of `body`,
+    so the body is parsed only if the endpoint needs it.
+    """
+    timings: dict[str, float] | None = None
+    """
+    Durations of the request processing phases in seconds,
+    recorded only if the app has the timing enabled.
+    """
+    deadline: float | None = None
+    """
+    `time.monotonic()` time the request must be answered by, e.g. derived from
+    the remaining time of the Lambda invocation or the route timeout.
+    """
 
     def __repr__(self) -> str:
         return f"Request({self.method} {self.path})"
 
+    def remaining_time(self) -> float | None:
+        """
+        Seconds left until the deadline, to budget the downstream calls.
+        """
+        return None if self.deadline is None else self.deadline - monotonic()
+
+    def decode_body(self) -> Any:
+        """
+        Decode the raw JSON body into `body`, if it's not decoded yet.
+
+        Raises:
+            JSONDecodeError: If the body is not a valid JSON.
+        """
+        if self.raw_body is not None:
+            self.body = json_loads(self.raw_body)
+            self.raw_body = None
+        return self.body
+
     def __str__(self) -> str:
         """
         Format the request data into a string for logging.
@@ -52,7 +142,9 @@ class ParsedRequest:
                 + f"\nparams: {self.params}"
             )
 
-        if self.body:
+        if self.raw_body:
+            request_str += f"\nbody: {self.raw_body!r}"
+        elif self.body:
             request_str += f"\nbody: {self.body}"
 
         if self.headers:
@@ -60,6 +152,42 @@ class ParsedRequest:
         return request_str
 
 
+def _check_path_model(path: str, handler: Callable):
+    """
+    Check that the fields of the handler's `path` model are the path parameters,
+    so a mismatch fails at the registration rather than each request.
+    """
+    param = signature(handler).parameters.get("path")
+    model = param.annotation if param is not None else None
+    if not isinstance(model, type) or not issubclass(model, BaseModel):
+        return
+
+    names = set(path_param_names(path))
+    fields = {field.alias or name: field for name, field in model.model_fields.items()}
+    required = {name for name, field in fields.items() if field.is_required()}
+    if not required <= names or not names <= fields.keys():
+        raise ValueError(
+            f"Path model {model.__name__} of {path or '/'} must have the fields"
+            f" {sorted(names)} of the path parameters, it has {sorted(fields)}"
+        )
+
+
+def _validate_json(model: Type[BaseModel], data: str | bytes) -> BaseModel:
+    """
+    Validate the raw JSON directly into the model, without decoding it to python first.
+    """
+    try:
+        return model.model_validate_json(data)
+    except ValidationError as e:
+        if e.error_count() == 1 and e.errors()[0]["type"] == "json_invalid":
+            # reparse to get the error position for the error fragment
+            json_loads(data)
+        raise
+
+
+TimingObserver = Callable[[ParsedRequest, Response, dict[str, float]], None]
+
+
 @dataclass(slots=True)
 class InvokeTemplate:
     """
@@ -67,34 +195,132 @@ class InvokeTemplate:
     """
 
     params: Type[BaseModel] | None
+    path: Type[BaseModel] | None
     body: Type[BaseModel] | None
     request: Type[Request] | None
     response: Type[BaseModel] | None
     status: int
     tags: list[str]
+    request_loader: Callable[[Any], Request] | None = None
+    compression: CompressionConfig | None = None
+    etag: bool = False
+    cache_control: str | None = None
+    dependencies: DependencyGraph | None = None
+    executor: Executor | None = None
+    """None runs the async handler right on the event loop."""
+    timeout: float | None = None
+    stream_format: StreamFormat | None = None
+
+    def build_models(self):
+        """
+        Force pydantic to build the validators and serializers of the models,
+        in case they are deferred or have unresolved forward references.
+        """
+        for model in (self.params, self.path, self.body, self.request, self.response):
+            if model is not None and not model.__pydantic_complete__:
+                model.model_rebuild()
 
     def prepare_method_args(self, request: ParsedRequest):
         args = {}
 
-        if self.request:
-            args["request"] = self.request.model_validate(request)
+        if self.body:
+            if request.raw_body is not None:
+                args["body"] = _validate_json(self.body, request.raw_body)
+            else:
+                args["body"] = self.body.model_validate(request.body)
+        if self.request_loader:
+            request.decode_body()
+            args["request"] = self.request_loader(request)
         if self.params:
             args["params"] = self.params.model_validate(request.params)
-        if self.body:
-            args["body"] = self.body.model_validate(request.body)
+        if self.path:
+            args["path"] = self.path.model_validate(request.path_params)
 
         return args
 
     def prepare_response(self, result: Any) -> Response:
+        if isinstance(result, Response):
+            # the handler has prepared the response itself, which may be shared,
+            # so the post-processing (compression, ETags) changes a copy
+            return replace(result, headers=dict(result.headers))
+        if self.stream_format:
+            return Response(
+                self.status,
+                body=None,
+                headers={"Content-Type": STREAM_CONTENT_TYPES[self.stream_format]},
+                stream=encode_stream(result, self.response, self.stream_format),
+            )
         if self.response:
-            if isinstance(result, BaseModel):
-                return Response(self.status, result.model_dump(mode="json"))
+            # serialize straight to JSON bytes in one pass,
+            # so the adapters don't have to encode the body again
+            if not isinstance(result, BaseModel):
+                result = self.response.model_validate(result)
             return Response(
                 self.status,
-                self.response.model_validate(result).model_dump(mode="json"),
+                result.__pydantic_serializer__.to_json(result),
+                raw=True,
             )
         return Response(self.status, body=None)
 
+    def get_encoding(self, accept_encoding: str | None) -> str | None:
+        """
+        Negotiate the encoding of the response body from `Accept-Encoding`.
+        """
+        if not self.compression or not accept_encoding:
+            return None
+        return negotiate_encoding(accept_encoding, self.compression.encodings)
+
+    def compress_response(self, response: Response, encoding: str | None):
+        """
+        Compress the response body with the negotiated encoding, see `get_encoding`.
+        """
+        config = self.compression
+        body = response.body
+        if not config or not response.raw or not body or len(body) < config.min_size:
+            return
+
+        headers = {**response.headers, "Vary": "Accept-Encoding"}
+        response.headers = headers
+        if not encoding:
+            return
+
+        if isinstance(body, str):
+            body = body.encode()
+
+        response.body = compress(body, encoding, config.level)
+        response.binary = True
+        headers["Content-Encoding"] = encoding
+
+        # the compressed body is semantically but not byte-for-byte the same
+        if (etag := headers.get("ETag")) and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+    def add_cache_headers(self, response: Response):
+        """
+        Add the ETag and the Cache-Control headers to the successful response.
+        """
+        if not 200 <= response.status < 300:
+            return
+
+        if self.etag and response.raw and response.body:
+            response.headers["ETag"] = make_etag(response.body)
+        if self.cache_control:
+            response.headers["Cache-Control"] = self.cache_control
+
+    def not_modified(self, response: Response) -> Response:
+        """
+        Make the empty 304 response, keeping the validator and caching headers.
+        """
+        headers = {
+            k: v
+            for k, v in response.headers.items()
+            if k in ("ETag", "Cache-Control", "Vary")
+        }
+        if self.compression:
+            # the 304 must vary as the compressed 200 it stands for
+            headers["Vary"] = "Accept-Encoding"
+        return Response(status=304, body=b"", headers=headers, raw=True)
+
 
 @dataclass(slots=True)
 class CORSConfig:
@@ -104,11 +330,28 @@ class CORSConfig:
     max_age: int = 3000
 
 
+class CompileMode(StrEnum):
+    """
+    When the invoke templates of the routes are built.
+    """
+
+    LAZY = "lazy"
+    """Each route is built on its first request."""
+    INIT = "init"
+    """Each route is built when it's registered."""
+    FIRST_REQUEST = "first_request"
+    """All routes are built together on the first request to the app."""
+
+
 @dataclass(slots=True)
 class RouteWrapper:
     handler: Callable
     config: RouteParams
     invoke_tamplate: InvokeTemplate | None = None
+    cache: ResponseCache | None = None
+    pipeline: Callable[[ParsedRequest], Awaitable[Response]] | None = None
+    """The middlewares and the endpoint handler composed into a single call."""
+    rate_limiter: RateLimiter | None = None
 
 
 class LambdaAPI(AbstractRouter):
@@ -118,6 +361,15 @@ class LambdaAPI(AbstractRouter):
         schema_id: str | None = None,
         cors: CORSConfig | None = None,
         tags: list[str] | None = None,
+        compile_mode: CompileMode = CompileMode.LAZY,
+        compression: CompressionConfig | None = None,
+        etag: bool = False,
+        server_timing: bool = False,
+        middlewares: list[Middleware] | None = None,
+        thread_workers: int | None = None,
+        process_workers: int | None = None,
+        max_concurrent_requests: int | None = None,
+        validation_errors: ValidationErrorConfig | None = None,
     ):
         """
         Initialize the LambdaAPI instance.
@@ -127,16 +379,54 @@ class LambdaAPI(AbstractRouter):
             schema_id: The id of the schema. Helpful when stitching multiple schemas together.
             cors: Response CORS configuration.
             tags: Tags to add to the endpoint.
+            compile_mode: When to build the routes' invoke templates. See `CompileMode`.
+            compression: Default response compression config of the routes.
+            etag: Add ETags to the responses and answer the matching
+                `If-None-Match` requests with 304 by default.
+            server_timing: Add the `Server-Timing` header with the durations
+                of the request processing phases. See `add_observer`.
+            middlewares: Middlewares of all the routes. See `add_middleware`.
+            thread_workers: Size of the thread pool of the sync handlers.
+            process_workers: Size of the process pool of the CPU-bound handlers.
+            max_concurrent_requests: Maximum number of the requests processed
+                at the same time, the rest are rejected with 503.
+            validation_errors: What the validation error responses include.
         """
 
         # dict[path, dict[method, function]]
         self.route_table: dict[str, dict[Method, RouteWrapper]] = {}
+        # the same endpoints as in route_table, split by the lookup:
+        # the exact paths and the paths with parameters
+        self.static_routes: dict[str, dict[Method, RouteWrapper]] = {}
+        self.path_tree: PathTree[dict[Method, RouteWrapper]] = PathTree()
 
         self.prefix = prefix
         self.schema_id = schema_id
         self.cors_config = cors
         self.common_response_headers = {}
         self.default_tags = tags or []
+        self.compile_mode = compile_mode
+        self.compression = compression
+        self.etag = etag
+        self.server_timing = server_timing
+        self.observers: list[TimingObserver] = []
+        # the phases are timed only if someone needs the timings
+        self.timing_enabled = server_timing
+        self.middlewares = middlewares or []
+        # values of the container-scoped dependencies
+        self.container = Container()
+        # the pools of the handlers run off the event loop, see `Executor`
+        self.executors = ExecutorPools(thread_workers, process_workers)
+        self.max_concurrent_requests = max_concurrent_requests
+        self.concurrent_requests = 0
+        self.validation_errors = validation_errors or ValidationErrorConfig()
+        self.startup_hooks: list[Callable[[], Any]] = []
+        self.shutdown_hooks: list[Callable[[], Any]] = []
+        self.started = False
+        self._startup_lock = asyncio.Lock()
+        self.compiled = False
+        # the generated OpenAPI documents, dropped when the routes change
+        self.schema_cache: dict[str, Any] = {}
 
         self._bake_headers()
 
@@ -154,9 +444,22 @@ class LambdaAPI(AbstractRouter):
             }
 
     async def run(self, request: ParsedRequest) -> Response:
-        endpoint = self.route_table.get(request.path)
+        if not self.compiled and self.compile_mode == CompileMode.FIRST_REQUEST:
+            self.compile()
+
+        timings = request.timings
+        if timings is None and self.timing_enabled:
+            timings = request.timings = {}
+        if timings is not None:
+            start = perf_counter()
+
+        endpoint = self.static_routes.get(request.path)
         method = request.method
 
+        if endpoint is None and self.path_tree:
+            if match := self.path_tree.lookup(request.path):
+                endpoint, request.path_params = match
+
         match (endpoint, method):
             case (None, _):
                 response = Response(status=404, body={"error": "Not Found"})
@@ -166,15 +469,18 @@ class LambdaAPI(AbstractRouter):
                 )
             case (_, _) if method in endpoint:
                 try:
-                    response = await self.run_endpoint_handler(
-                        endpoint[method], request
-                    )
+                    response = await self.run_route(endpoint[method], request)
                 except APIError as e:
-                    response = Response(status=e._status, body={"error": str(e)})
-                except ValidationError as e:
+                    response = Response(status=e.status, body={"error": str(e)})
+                except JSONDecodeError as e:
                     response = Response(
-                        status=400, body=f'{{"error": {e.json()}}}', raw=True
+                        status=400,
+                        body={
+                            "error": "Invalid JSON:\n" + json_decode_error_fragment(e)
+                        },
                     )
+                except ValidationError as e:
+                    response = self.validation_error_response(e)
                 except Exception as e:
                     logger.error(
                         f"Unhandled exception.\nREQUEST:\n{request}\nERROR:",
@@ -186,26 +492,287 @@ class LambdaAPI(AbstractRouter):
             case _:
                 response = Response(status=405, body={"error": "Method Not Allowed"})
 
+        if timings is not None:
+            timings["total"] = perf_counter() - start
+            self.report_timings(request, response, timings)
+
         return response
 
+    def on_startup(self, fn: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Register a (sync or async) function to run once before the first request,
+        e.g. to open the connection pools.
+        """
+        self.startup_hooks.append(fn)
+        return fn
+
+    def on_shutdown(self, fn: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Register a (sync or async) function to run when the server stops.
+        Only the ASGI servers report it, Lambda containers are just frozen and killed.
+        """
+        self.shutdown_hooks.append(fn)
+        return fn
+
+    async def startup(self):
+        """
+        Run the startup hooks once. The adapters call it before the first event.
+        """
+        if self.started:
+            return
+
+        async with self._startup_lock:
+            if self.started:
+                return
+            for hook in self.startup_hooks:
+                result = hook()
+                if isawaitable(result):
+                    await result
+            self.started = True
+
+    async def shutdown(self):
+        """
+        Run the shutdown hooks in the reverse order and drop the container-scoped
+        dependencies. A failed hook doesn't prevent the others from running.
+        """
+        for hook in reversed(self.shutdown_hooks):
+            try:
+                result = hook()
+                if isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error("Shutdown hook failed", exc_info=e)
+
+        self.container.clear()
+        self.executors.shutdown()
+        self.started = False
+
+    def add_observer(self, observer: TimingObserver):
+        """
+        Register a function called after each request with the request, the response
+        and the durations of the request processing phases in seconds:
+        `parse` (by the adapter), `validate`, `handler`, `serialize` and `total`.
+        """
+        self.observers.append(observer)
+        self.timing_enabled = True
+
+    def report_timings(
+        self, request: ParsedRequest, response: Response, timings: dict[str, float]
+    ):
+        if self.server_timing:
+            response.headers = {
+                **response.headers,
+                "Server-Timing": ", ".join(
+                    f"{name};dur={duration * 1000:.3f}"
+                    for name, duration in timings.items()
+                ),
+            }
+
+        for observer in self.observers:
+            try:
+                observer(request, response, timings)
+            except Exception as e:
+                logger.error("Timing observer failed", exc_info=e)
+
+    def add_middleware(self, middleware: Middleware) -> Middleware:
+        """
+        Add a middleware to all the routes. The middlewares run in the order they are
+        added, before the routers' and the routes' own ones. See `Middleware`.
+        """
+        self.middlewares.append(middleware)
+        # recompose the pipelines on their next request
+        for endpoint in self.route_table.values():
+            for route in endpoint.values():
+                route.pipeline = None
+        return middleware
+
+    def get_pipeline(
+        self, route: RouteWrapper
+    ) -> Callable[[ParsedRequest], Awaitable[Response]]:
+        """
+        Compose the middlewares and the endpoint handler of the route
+        into a single callable once, so the requests don't iterate over the chain.
+        """
+        if route.pipeline is not None:
+            return route.pipeline
+
+        self.get_invoke_template(route)
+
+        pipeline = partial(self.run_endpoint_handler, route)
+        for middleware in reversed(
+            [*self.middlewares, *route.config.get("middlewares", ())]
+        ):
+            pipeline = partial(middleware, call_next=pipeline)
+
+        route.pipeline = pipeline
+        return pipeline
+
+    async def run_route(self, route: RouteWrapper, request: ParsedRequest) -> Response:
+        """
+        Run the route pipeline if the request is within the app and the route limits.
+        The limits are checked before the middlewares and the validation.
+
+        Raises:
+            ServiceUnavailableError: If `max_concurrent_requests` are running already.
+            TooManyRequestsError: If the request is over the route rate limit.
+        """
+        if (
+            self.max_concurrent_requests is not None
+            and self.concurrent_requests >= self.max_concurrent_requests
+        ):
+            raise ServiceUnavailableError()
+        if route.rate_limiter is not None and not route.rate_limiter.acquire(request):
+            raise TooManyRequestsError()
+
+        self.concurrent_requests += 1
+        try:
+            response = await self.run_pipeline(route, request)
+        except BaseException:
+            self.release_request()
+            raise
+
+        if response.stream is None:
+            self.release_request()
+        else:
+            # the handler runs until the stream ends, so does the request
+            response.stream = BoundedStream(
+                response.stream, request.deadline, self.release_request
+            )
+        return response
+
+    def release_request(self):
+        """
+        Free the concurrent request slot taken by `run_route`.
+        """
+        self.concurrent_requests -= 1
+
+    async def run_pipeline(
+        self, route: RouteWrapper, request: ParsedRequest
+    ) -> Response:
+        """
+        Run the route pipeline, cancelling it once the request deadline
+        or the route timeout passes. The handlers run in the pools aren't
+        interrupted, only their results are dropped.
+
+        Raises:
+            GatewayTimeoutError: If the deadline has passed.
+        """
+        pipeline = self.get_pipeline(route)
+
+        deadline = request.deadline
+        timeout = route.invoke_tamplate.timeout  # type: ignore
+        if timeout is not None:
+            route_deadline = monotonic() + timeout
+            if deadline is None or route_deadline < deadline:
+                deadline = request.deadline = route_deadline
+
+        if deadline is None:
+            return await pipeline(request)
+
+        try:
+            async with asyncio.timeout(deadline - monotonic()) as scope:
+                return await pipeline(request)
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            logger.warning(f"Request timed out.\nREQUEST:\n{request}")
+            raise GatewayTimeoutError() from None
+
+    def validation_error_response(self, error: ValidationError) -> Response:
+        return Response(
+            status=400,
+            body=encode_validation_error(error, self.validation_errors),
+            raw=True,
+        )
+
     async def run_endpoint_handler(
         self, route: RouteWrapper, request: ParsedRequest
     ) -> Response:
         template = self.get_invoke_template(route)
 
+        encoding = (
+            template.get_encoding(request.headers.get("accept_encoding"))
+            if template.compression
+            else None
+        )
+        compressed = False
+
+        cache = route.cache
+        if cache is not None:
+            # the responses are cached compressed, one variant per encoding,
+            # so the hits don't compress them again
+            cache_key = (
+                cache.make_key(request.path, request.params, request.headers),
+                encoding,
+            )
+            # the cache keeps its own copies, so the post-processing below
+            # doesn't change the cached responses
+            if (cached := cache.get(cache_key)) is not None:
+                response = replace(cached, headers=dict(cached.headers))
+                compressed = True
+            else:
+                response = await self.call_endpoint_handler(route, template, request)
+                if 200 <= response.status < 300 and response.raw:
+                    template.compress_response(response, encoding)
+                    compressed = True
+                    cache.set(
+                        cache_key,
+                        replace(response, headers=dict(response.headers)),
+                        len(response.body or ""),
+                    )
+        else:
+            response = await self.call_endpoint_handler(route, template, request)
+
+        if (
+            template.etag
+            and request.method == Method.GET
+            and (etag := response.headers.get("ETag"))
+            and (if_none_match := request.headers.get("if_none_match"))
+            and etag_matches(if_none_match, etag)
+        ):
+            return template.not_modified(response)
+
+        if template.compression and not compressed:
+            template.compress_response(response, encoding)
+        return response
+
+    async def call_endpoint_handler(
+        self, route: RouteWrapper, template: InvokeTemplate, request: ParsedRequest
+    ) -> Response:
+        timings = request.timings
+        if timings is not None:
+            start = perf_counter()
+
         # this ValidationError is raised when the request data is invalid
         # we can return it to the client
         try:
             args = template.prepare_method_args(request)
         except ValidationError as e:
-            return Response(status=400, body={"error": e.json()})
+            return self.validation_error_response(e)
 
-        result = await route.handler(**args)
+        if template.dependencies:
+            args.update(await template.dependencies.resolve(request, self.container))
+
+        if timings is not None:
+            handler_start = perf_counter()
+            timings["validate"] = handler_start - start
+
+        if template.stream_format:
+            # the async generator runs while the response is sent
+            result = route.handler(**args)
+        elif template.executor is None:
+            result = await route.handler(**args)
+        else:
+            result = await self.executors.run(template.executor, route.handler, args)
+
+        if timings is not None:
+            serialize_start = perf_counter()
+            timings["handler"] = serialize_start - handler_start
 
         # this ValidationError is raised when the response data is invalid
         # we can log it and return a generic error to the client to avoid leaking
         try:
-            return template.prepare_response(result)
+            response = template.prepare_response(result)
         except ValidationError as e:
             logger.error(
                 f"Response data is invalid.\nREQUEST:\n{request}\nERROR:",
@@ -213,15 +780,81 @@ class LambdaAPI(AbstractRouter):
             )
             return Response(status=500, body={"error": "Internal Server Error"})
 
+        if timings is not None:
+            timings["serialize"] = perf_counter() - serialize_start
+
+        template.add_cache_headers(response)
+        return response
+
+    def invalidate_cache(self, path: str | None = None):
+        """
+        Drop the cached responses of the route registered with the path,
+        or of all the routes.
+        """
+        endpoints = (
+            [self.route_table.get(path, {})]
+            if path is not None
+            else self.route_table.values()
+        )
+        for endpoint in endpoints:
+            for route in endpoint.values():
+                if route.cache is not None:
+                    route.cache.invalidate()
+
+    def compile(self) -> dict[tuple[str, Method], float]:
+        """
+        Build the invoke templates of all the routes ahead of time,
+        including the pydantic validators and serializers they use.
+
+        Returns:
+            The build time in seconds of each route, keyed by (path, method).
+        """
+        timings = {}
+        for path, endpoint in self.route_table.items():
+            for method, route in endpoint.items():
+                start = perf_counter()
+                self.get_pipeline(route)
+                timings[(path, method)] = perf_counter() - start
+
+                logger.debug(
+                    f"Compiled {method} {path or '/'} in "
+                    f"{timings[(path, method)] * 1000:.2f}ms"
+                )
+
+        self.compiled = True
+        return timings
+
     def get_invoke_template(self, route: RouteWrapper):
         if route.invoke_tamplate:
             return route.invoke_tamplate
 
         fn_signature = signature(route.handler)
-        params = fn_signature.parameters
+        dependencies = {
+            name: param.default
+            for name, param in fn_signature.parameters.items()
+            if isinstance(param.default, Depends)
+        }
+        params = {
+            name: param
+            for name, param in fn_signature.parameters.items()
+            if name not in dependencies
+        }
         return_type = fn_signature.return_annotation
 
-        if return_type is not _empty and return_type is not None:
+        stream_format = None
+        if isasyncgenfunction(route.handler):
+            # the items of AsyncIterator[Item] are validated one by one
+            stream_format = StreamFormat(
+                route.config.get("stream", StreamFormat.NDJSON)
+            )
+            return_type = next(iter(get_args(return_type)), None)
+            if route.config.get("executor", Executor.INLINE) != Executor.INLINE:
+                raise ValueError("Streaming handlers can only run inline")
+
+        if return_type is Response:
+            # the handler prepares the response itself
+            return_type = None
+        elif return_type is not _empty and return_type is not None:
             if not isinstance(return_type, type) or not issubclass(
                 return_type, BaseModel
             ):
@@ -229,28 +862,107 @@ class LambdaAPI(AbstractRouter):
         else:
             return_type = None
 
-        route.invoke_tamplate = InvokeTemplate(  # type: ignore
+        # look through the decorators, so the wrapped async handlers stay on the loop
+        is_async = stream_format is not None or iscoroutinefunction(
+            unwrap(route.handler)
+        )
+        executor = Executor(
+            route.config.get(
+                "executor", Executor.INLINE if is_async else Executor.THREAD
+            )
+        )
+
+        template = InvokeTemplate(  # type: ignore
             params=params["params"].annotation if "params" in params else None,
+            path=params["path"].annotation if "path" in params else None,
             body=params["body"].annotation if "body" in params else None,
             request=params["request"].annotation if "request" in params else None,
             response=return_type,
             status=route.config.get("status", 200),
             tags=route.config.get("tags", self.default_tags) or [],
+            compression=route.config.get("compression", self.compression),
+            etag=route.config.get("etag", self.etag),
+            cache_control=route.config.get("cache_control"),
+            dependencies=DependencyGraph(dependencies) if dependencies else None,
+            executor=None if is_async and executor == Executor.INLINE else executor,
+            timeout=route.config.get("timeout"),
+            stream_format=stream_format,
         )
-        return route.invoke_tamplate
+        template.build_models()
+        if template.request:
+            template.request_loader = make_request_loader(template.request)
+
+        route.invoke_tamplate = template
+        return template
 
     def decorate_route(
         self, fn: Callable, path: str, method: Method, config: RouteParams
     ) -> Callable:
         path = "/" + path.lstrip("/") if path else ""
+        if is_path_template(path):
+            path = path.rstrip("/")
+
+        _check_path_model(path, fn)
+
+        self.schema_cache.clear()
         if path not in self.route_table:
-            endpoint = self.route_table[path] = {}
+            endpoint = {}
+            if is_path_template(path):
+                self.path_tree.insert(path, endpoint)
+            else:
+                self.static_routes[path] = endpoint
+            self.route_table[path] = endpoint
         else:
             endpoint = self.route_table[path]
 
-        endpoint[method] = RouteWrapper(handler=fn, config=config)
+        endpoint[method] = route = RouteWrapper(handler=fn, config=config)
+        if method == Method.GET and config.get("cache_ttl"):
+            route.cache = ResponseCache(
+                ttl=config["cache_ttl"],
+                max_entries=config.get("cache_size", 256),
+                max_bytes=config.get("cache_max_bytes"),
+                vary_headers=config.get("cache_vary_headers", ()),
+            )
+        if "rate_limit" in config:
+            route.rate_limiter = RateLimiter(config["rate_limit"])
+        if self.compile_mode == CompileMode.INIT:
+            self.get_pipeline(route)
         return fn
 
+    def add_openapi_route(
+        self,
+        path: str = "/openapi.json",
+        file: str | PathLike[str] | None = None,
+        **config: Unpack[RouteParams],
+    ):
+        """
+        Serve the OpenAPI document of the app as pre-encoded JSON.
+
+        Args:
+            path: The path of the route.
+            file: The document generated at the build time with
+                `python -m lambda_api.docsgen`, read on the first request
+                instead of generating the document.
+            config: The route parameters, e.g. `etag` or `cache_control`.
+        """
+        content = None
+
+        async def openapi() -> Response:
+            nonlocal content
+            if file is not None:
+                if content is None:
+                    with open(file, "rb") as f:
+                        content = f.read()
+                return Response(200, content, raw=True)
+
+            from lambda_api.docsgen import OpenApiGenerator
+
+            return Response(200, OpenApiGenerator(self).get_schema_bytes(), raw=True)
+
+        self.decorate_route(
+            openapi, path, Method.GET, {"include_in_schema": False, **config}
+        )
+
     def get_routes(
         self, prefix: str
     ) -> Iterable[tuple[Callable, str, Method, RouteParams]]:
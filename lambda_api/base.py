@@ -1,11 +1,24 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Callable, Iterable, NotRequired, TypedDict, Unpack
+from typing import Any, Awaitable, Callable, Iterable, NotRequired, TypedDict, Unpack
 
+from lambda_api.compression import CompressionConfig
+from lambda_api.executors import Executor
+from lambda_api.limits import RateLimit
 from lambda_api.schema import Method
+from lambda_api.streaming import StreamFormat
 
 logger = logging.getLogger(__name__)
 
+Middleware = Callable[..., Awaitable[Any]]
+"""
+`async def middleware(request: ParsedRequest, call_next) -> Response`
+
+Calls `await call_next(request)` to run the rest of the chain and the endpoint,
+or returns its own response to short-circuit before the request is validated.
+`call_next` is passed by name.
+"""
+
 
 class RouteParams(TypedDict):
     """
@@ -15,6 +28,32 @@ class RouteParams(TypedDict):
 
     status: NotRequired[int]
     tags: NotRequired[list[str] | None]
+    compression: NotRequired[CompressionConfig | None]
+    """Response compression config, None disables the app's default one."""
+    cache_ttl: NotRequired[float]
+    """Cache the responses of a GET route for the given number of seconds."""
+    cache_size: NotRequired[int]
+    """Maximum number of the cached responses, 256 by default."""
+    cache_max_bytes: NotRequired[int]
+    """Maximum total size of the cached responses."""
+    cache_vary_headers: NotRequired[list[str]]
+    """Request headers the cached responses depend on."""
+    etag: NotRequired[bool]
+    """Add ETags to the responses and answer the matching requests with 304."""
+    cache_control: NotRequired[str]
+    """Cache-Control header of the successful responses."""
+    middlewares: NotRequired[list[Middleware]]
+    """Middlewares of the route, run after the app's and the routers' ones."""
+    executor: NotRequired[Executor | str]
+    """Where the handler runs, inline for the async and thread for the sync ones."""
+    timeout: NotRequired[float]
+    """Seconds the route has to respond in, or it's cancelled with 504."""
+    rate_limit: NotRequired[RateLimit]
+    """Reject the requests over the limit with 429, before they are validated."""
+    include_in_schema: NotRequired[bool]
+    """Document the route in the OpenAPI schema, True by default."""
+    stream: NotRequired[StreamFormat | str]
+    """Format of the items yielded by an async generator handler, NDJSON by default."""
 
 
 class AbstractRouter(ABC):
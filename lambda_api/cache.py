@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Iterable, Mapping
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 256,
+        max_bytes: int | None = None,
+        vary_headers: Iterable[str] = (),
+    ):
+        """
+        In-memory LRU cache of the serialized responses of a route.
+
+        Args:
+            ttl: Time to live of the entries in seconds.
+            max_entries: Maximum number of the entries, the least recently used
+                entries are evicted first.
+            max_bytes: Maximum total size of the cached bodies.
+            vary_headers: Request headers the response depends on.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.vary_headers = tuple(
+            name.lower().replace("-", "_") for name in vary_headers
+        )
+
+        # key -> (expiration time, response, size)
+        self.entries: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(
+        self, path: str, params: Mapping[str, Any], headers: Mapping[str, Any]
+    ) -> Hashable:
+        """
+        Build the cache key from the request path, the query parameters
+        (in any order) and the vary headers.
+        """
+        return (
+            path,
+            tuple(
+                sorted(
+                    (k, tuple(v) if isinstance(v, list) else v)
+                    for k, v in params.items()
+                )
+            ),
+            tuple(headers.get(name) for name in self.vary_headers),
+        )
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires, response, size = entry
+        if expires <= monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def set(self, key: Hashable, response: Any, size: int):
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self._remove(key)
+
+        self.entries[key] = (monotonic() + self.ttl, response, size)
+        self.size += size
+
+        while len(self.entries) > self.max_entries or (
+            self.max_bytes is not None and self.size > self.max_bytes
+        ):
+            self._remove(next(iter(self.entries)))
+
+    def invalidate(self, path: str | None = None):
+        """
+        Drop the entries of the request path, or all of them.
+        """
+        if path is None:
+            self.entries.clear()
+            self.size = 0
+            return
+
+        for key in [key for key in self.entries if key[0] == path]:  # type: ignore
+            self._remove(key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+    def _remove(self, key: Hashable):
+        _, _, size = self.entries.pop(key)
+        self.size -= size
@@ -0,0 +1,55 @@
+import zlib
+from dataclasses import dataclass
+from typing import Sequence
+
+# zlib window bits producing the gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+@dataclass(slots=True)
+class CompressionConfig:
+    min_size: int = 1024
+    """Minimum body size in bytes to compress, smaller bodies are sent as is."""
+    level: int = 6
+    """Compression level, 1 (fastest) - 9 (smallest)."""
+    encodings: tuple[str, ...] = ("gzip", "deflate")
+    """Supported encodings, in the order of preference."""
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> str | None:
+    """
+    Choose the encoding from the `Accept-Encoding` header value.
+
+    Returns:
+        The encoding with the highest quality, or None if nothing is acceptable.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "gzip":
+        return zlib.compress(data, level, wbits=GZIP_WBITS)
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+    raise ValueError(f"Unsupported encoding: {encoding}")
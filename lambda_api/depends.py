@@ -0,0 +1,152 @@
+"""
+Dependency injection of the endpoint handlers.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from enum import StrEnum
+from inspect import Parameter, iscoroutinefunction, signature
+from typing import Any, Callable
+
+_REQUEST = -1
+_MISSING = object()
+
+
+class DependencyScope(StrEnum):
+    """
+    How long the value of a dependency lives.
+    """
+
+    REQUEST = "request"
+    """Computed once per request, even if several dependencies need it."""
+    CONTAINER = "container"
+    """Created once per app (i.e. per warm Lambda or ASGI worker) and reused."""
+
+
+@dataclass(slots=True, frozen=True)
+class Depends:
+    """
+    Default value of a handler or a dependency parameter, marking it to be injected.
+
+    ```
+    async def get_client() -> Client: ...
+
+    @app.get("/items")
+    async def get_items(client: Client = Depends(get_client, scope="container")): ...
+    ```
+
+    The dependency gets the `ParsedRequest` in its parameter named `request`,
+    unless it's container-scoped.
+    """
+
+    dependency: Callable[..., Any]
+    scope: DependencyScope | str = DependencyScope.REQUEST
+
+
+@dataclass(slots=True)
+class _Node:
+    fn: Callable[..., Any]
+    scope: DependencyScope
+    is_async: bool
+    # parameter name -> index of the dependency node or _REQUEST
+    args: dict[str, int]
+
+    async def call(self, values: list[Any], request: Any) -> Any:
+        result = self.fn(
+            **{
+                name: request if index == _REQUEST else values[index]
+                for name, index in self.args.items()
+            }
+        )
+        if self.is_async:
+            result = await result
+        return result
+
+
+class Container:
+    """
+    Values of the container-scoped dependencies, shared by all the requests of the app.
+    """
+
+    def __init__(self):
+        self.values: dict[Callable, Any] = {}
+        self.locks: dict[Callable, asyncio.Lock] = {}
+
+    async def create(self, node: _Node, values: list[Any]) -> Any:
+        # concurrent requests wait for the first one instead of creating duplicates
+        async with self.locks.setdefault(node.fn, asyncio.Lock()):
+            if node.fn not in self.values:
+                self.values[node.fn] = await node.call(values, None)
+        return self.values[node.fn]
+
+    def clear(self):
+        self.values.clear()
+        self.locks.clear()
+
+
+class DependencyGraph:
+    """
+    Dependencies of a handler, flattened in the evaluation order when the route is built.
+
+    Raises:
+        ValueError: On a dependency cycle, or if a container-scoped dependency
+            depends on the request.
+        TypeError: If a dependency has a parameter that can't be injected.
+    """
+
+    def __init__(self, dependencies: dict[str, Depends]):
+        self.nodes: list[_Node] = []
+        self.indexes: dict[Callable, int] = {}
+        self.handler_args = {
+            name: self.add(dependency, ()) for name, dependency in dependencies.items()
+        }
+
+    def add(self, dependency: Depends, parents: tuple[Callable, ...]) -> int:
+        fn = dependency.dependency
+        scope = DependencyScope(dependency.scope)
+
+        if fn in self.indexes:
+            index = self.indexes[fn]
+            if self.nodes[index].scope != scope:
+                raise ValueError(f"Dependency {fn} is used with different scopes")
+            return index
+        if fn in parents:
+            raise ValueError(f"Dependency cycle: {[*parents, fn]}")
+
+        args = {}
+        for name, param in signature(fn).parameters.items():
+            if isinstance(param.default, Depends):
+                index = self.add(param.default, (*parents, fn))
+                if (
+                    scope == DependencyScope.CONTAINER
+                    and self.nodes[index].scope == DependencyScope.REQUEST
+                ):
+                    raise ValueError(
+                        f"Container dependency {fn} depends on the request "
+                        f"dependency {param.default.dependency}"
+                    )
+                args[name] = index
+            elif name == "request" and scope == DependencyScope.REQUEST:
+                args[name] = _REQUEST
+            elif param.default is Parameter.empty:
+                raise TypeError(f"Can't inject the parameter {name!r} of {fn}")
+
+        self.nodes.append(_Node(fn, scope, iscoroutinefunction(fn), args))
+        self.indexes[fn] = len(self.nodes) - 1
+        return self.indexes[fn]
+
+    async def resolve(self, request: Any, container: Container) -> dict[str, Any]:
+        """
+        Get the values of the handler's dependencies, keyed by the parameter names.
+        """
+        values: list[Any] = []
+        for node in self.nodes:
+            if node.scope == DependencyScope.CONTAINER:
+                value = container.values.get(node.fn, _MISSING)
+                if value is _MISSING:
+                    value = await container.create(node, values)
+            else:
+                value = await node.call(values, request)
+            values.append(value)
+
+        return {name: values[index] for name, index in self.handler_args.items()}
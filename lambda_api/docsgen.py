@@ -1,9 +1,25 @@
+"""
+OpenAPI document generation.
+
+Usage: python -m lambda_api.docsgen module:app [--output openapi.json]
+
+Generating the document at the build time lets the app serve it from the file
+(see `LambdaAPI.add_openapi_route`), without running the generation in production.
+"""
+
+import argparse
 import inspect
-from collections import defaultdict
+import sys
+from copy import deepcopy
+from importlib import import_module
 from typing import Any
 
 from lambda_api.app import LambdaAPI, RouteWrapper
-from lambda_api.utils import json_dumps, json_loads
+from lambda_api.path_tree import openapi_path
+from lambda_api.streaming import STREAM_CONTENT_TYPES, StreamFormat
+from lambda_api.utils import json_dumps_bytes
+
+REF_TEMPLATE = "#/components/schemas/{model}"
 
 
 class OpenApiGenerator:
@@ -13,21 +29,40 @@ class OpenApiGenerator:
         self.route_table = app.route_table
         self.prefix = app.prefix
 
-    def get_schema(self):
-        schema = {
-            "paths": defaultdict(lambda: defaultdict(dict)),
-            "components": {"schemas": {}},
-        }
+    def get_schema(self) -> dict[str, Any]:
+        """
+        Get the OpenAPI document of the app, a copy the caller may modify.
+        """
+        return deepcopy(self._get_cached_schema())
+
+    def get_schema_bytes(self) -> bytes:
+        """
+        Get the OpenAPI document encoded to JSON.
+
+        The document and its encoding are built once and reused until the routes change.
+        """
+        cache = self.app.schema_cache
+        if (content := cache.get("bytes")) is None:
+            content = cache["bytes"] = json_dumps_bytes(self._get_cached_schema())
+        return content
+
+    def _get_cached_schema(self) -> dict[str, Any]:
+        cache = self.app.schema_cache
+        if (schema := cache.get("schema")) is not None:
+            return schema
+
+        schema = {"paths": {}, "components": {"schemas": {}}}
 
         if self.schema_id:
             schema["id"] = self.schema_id
 
         for path, endpoint in self.route_table.items():
             for method, func in endpoint.items():
-                self._add_endpoint_to_schema(schema, path, method, func)
+                if func.config.get("include_in_schema", True):
+                    self._add_endpoint_to_schema(schema, path, method, func)
 
-        txt_schema = json_dumps(schema).replace("$defs", "components/schemas")
-        return json_loads(txt_schema)
+        cache["schema"] = schema
+        return schema
 
     def _add_endpoint_to_schema(
         self, schema: dict[str, Any], path: str, method: str, route: RouteWrapper
@@ -35,19 +70,23 @@ class OpenApiGenerator:
         components = schema["components"]["schemas"]
 
         template = self.app.get_invoke_template(route)
-        full_path = self.prefix + path
-        func_schema = schema["paths"][full_path][method.lower()]
+        full_path = self.prefix + openapi_path(path)
+        func_schema: dict[str, Any] = {}
+        schema["paths"].setdefault(full_path, {})[method.lower()] = func_schema
 
         if route.handler.__doc__:
             func_schema["description"] = inspect.getdoc(route.handler)
 
         if template.request:
             # Handle headers
-            headers = (
-                template.request.model_fields["headers"].annotation
-            ).model_json_schema()  # type: ignore
+            headers_model = template.request.model_fields["headers"].annotation
+            headers = headers_model.model_json_schema(  # type: ignore
+                ref_template=REF_TEMPLATE
+            )
             required_keys = headers.get("required", [])
 
+            components.update(headers.pop("$defs", {}))
+
             func_schema["parameters"] = func_schema.get("parameters", []) + [
                 {
                     "in": "header",
@@ -65,7 +104,7 @@ class OpenApiGenerator:
 
         # Handle QUERY parameters
         if template.params:
-            params = template.params.model_json_schema()
+            params = template.params.model_json_schema(ref_template=REF_TEMPLATE)
             required_keys = params.get("required", [])
 
             components.update(params.pop("$defs", {}))
@@ -76,9 +115,20 @@ class OpenApiGenerator:
                 for k, v in params["properties"].items()
             ]
 
+        # Handle PATH parameters
+        if template.path:
+            path_params = template.path.model_json_schema(ref_template=REF_TEMPLATE)
+
+            components.update(path_params.pop("$defs", {}))
+
+            func_schema["parameters"] = func_schema.get("parameters", []) + [
+                {"in": "path", "name": k, "required": True, "schema": v}
+                for k, v in path_params["properties"].items()
+            ]
+
         # Handle BODY parameters
         if template.body:
-            body = template.body.model_json_schema()
+            body = template.body.model_json_schema(ref_template=REF_TEMPLATE)
             comp_title = body["title"]
 
             components[comp_title] = body
@@ -94,19 +144,27 @@ class OpenApiGenerator:
 
         # Handle response schema
         if template.response:
-            response = template.response.model_json_schema(mode="serialization")
+            response = template.response.model_json_schema(
+                mode="serialization", ref_template=REF_TEMPLATE
+            )
             comp_title = response["title"]
 
             components[comp_title] = response
             components.update(response.pop("$defs", {}))
 
+            content_type = "application/json"
+            content_schema: dict[str, Any] = {
+                "$ref": f"#/components/schemas/{comp_title}"
+            }
+            # the streamed items are documented as an array or as a line of NDJSON
+            if template.stream_format:
+                content_type = STREAM_CONTENT_TYPES[template.stream_format]
+                if template.stream_format == StreamFormat.JSON:
+                    content_schema = {"type": "array", "items": content_schema}
+
             func_schema["responses"] = {
                 str(template.status): {
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": f"#/components/schemas/{comp_title}"}
-                        }
-                    }
+                    "content": {content_type: {"schema": content_schema}}
                 }
             }
         else:
@@ -117,3 +175,24 @@ class OpenApiGenerator:
         # Handle tags
         if template.tags:
             func_schema["tags"] = template.tags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("target", help="The app to document, as `module:attribute`")
+    parser.add_argument("--output", "-o", help="The file to write, stdout by default")
+    args = parser.parse_args()
+
+    module_name, _, attr = args.target.partition(":")
+    app = getattr(import_module(module_name), attr or "app")
+    content = OpenApiGenerator(app).get_schema_bytes()
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(content)
+    else:
+        sys.stdout.buffer.write(content)
+
+
+if __name__ == "__main__":
+    main()
@@ -60,3 +60,13 @@ class UnprocessableEntityError(APIError):
 class NotImplementedHTTPError(APIError):
     _status = 501
     _message = "Not Implemented"
+
+
+class GatewayTimeoutError(APIError):
+    _status = 504
+    _message = "Gateway Timeout"
+
+
+class ServiceUnavailableError(APIError):
+    _status = 503
+    _message = "Service Unavailable"
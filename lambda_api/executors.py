@@ -0,0 +1,96 @@
+"""
+Running the endpoint handlers off the event loop.
+"""
+
+import asyncio
+from concurrent.futures import Executor as PoolExecutor
+from enum import StrEnum
+from inspect import isawaitable
+from typing import Any, Callable
+
+
+class Executor(StrEnum):
+    """
+    Where the endpoint handler runs.
+    """
+
+    INLINE = "inline"
+    """On the event loop. The default for the async handlers."""
+    THREAD = "thread"
+    """In the thread pool. The default for the sync handlers."""
+    PROCESS = "process"
+    """
+    In the process pool, for the CPU-bound handlers. The handler and its arguments
+    must be picklable, e.g. the handler must be a module level function.
+    Not available on AWS Lambda, which lacks the shared memory the pool needs.
+    """
+
+
+def call_handler(fn: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
+    """
+    Call the handler in a pool worker, awaiting the async one on a new event loop.
+    """
+    result = fn(**kwargs)
+    if isawaitable(result):
+        return asyncio.run(result)  # type: ignore
+    return result
+
+
+class ExecutorPools:
+    """
+    The thread and the process pools of the app, created on the first use and reused.
+    """
+
+    def __init__(
+        self, thread_workers: int | None = None, process_workers: int | None = None
+    ):
+        """
+        Args:
+            thread_workers: Size of the thread pool, see `ThreadPoolExecutor`.
+            process_workers: Size of the process pool, the number of CPUs by default.
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.thread_pool: PoolExecutor | None = None
+        self.process_pool: PoolExecutor | None = None
+
+    def get_pool(self, executor: Executor) -> PoolExecutor:
+        # the pools are imported lazily, the process one loads multiprocessing
+        if executor == Executor.THREAD:
+            if self.thread_pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self.thread_pool = ThreadPoolExecutor(
+                    self.thread_workers, thread_name_prefix="lambda-api"
+                )
+            return self.thread_pool
+
+        if self.process_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.process_pool = ProcessPoolExecutor(self.process_workers)
+        return self.process_pool
+
+    async def run(
+        self, executor: Executor, fn: Callable[..., Any], kwargs: dict[str, Any]
+    ) -> Any:
+        if executor == Executor.INLINE:
+            result = fn(**kwargs)
+            # e.g. an async handler behind a sync decorator
+            if isawaitable(result):
+                result = await result
+            return result
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.get_pool(executor), call_handler, fn, kwargs
+        )
+
+    def shutdown(self):
+        """
+        Shut down the created pools, waiting for the running handlers.
+        """
+        for pool in (self.thread_pool, self.process_pool):
+            if pool is not None:
+                pool.shutdown()
+        self.thread_pool = None
+        self.process_pool = None
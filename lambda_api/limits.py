@@ -0,0 +1,99 @@
+"""
+Token bucket rate limits of the routes.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+
+@dataclass(slots=True)
+class RateLimit:
+    """
+    Rate limit of a route, see `RouteParams.rate_limit`.
+    """
+
+    rate: float
+    """Requests per second."""
+    burst: int | None = None
+    """Requests allowed at once after the idle time, `rate` (at least 1) by default."""
+    key: Callable[[Any], Hashable] | None = None
+    """
+    Get the key of the request (a `ParsedRequest`) to limit each key separately,
+    e.g. `by_header("x-api-key")` or `by_source_ip`. The whole route is limited
+    at once by default.
+    """
+    max_keys: int = 10000
+    """Maximum number of the tracked keys, the least recently used are dropped."""
+
+
+def by_header(name: str) -> Callable[[Any], Hashable]:
+    """
+    Limit the requests by the value of the header.
+    """
+    name = name.lower().replace("-", "_")
+    return lambda request: request.headers.get(name)
+
+
+def by_source_ip(request: Any) -> Hashable:
+    """
+    Limit the requests by the client IP address.
+    """
+    data = request.provider_data
+    context = data.get("requestContext") or {}
+    if ip := (context.get("identity") or {}).get("sourceIp"):  # REST API
+        return ip
+    if ip := (context.get("http") or {}).get("sourceIp"):  # HTTP API
+        return ip
+    if client := data.get("client"):  # ASGI
+        return client[0]
+    if forwarded := request.headers.get("x_forwarded_for"):  # ALB
+        return forwarded.split(",")[0].strip()
+    return None
+
+
+@dataclass(slots=True)
+class _Bucket:
+    tokens: float
+    updated: float
+
+
+class RateLimiter:
+    """
+    Token buckets of a rate limit, one per key.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.rate = limit.rate
+        self.capacity = limit.burst or max(limit.rate, 1)
+        self.key = limit.key
+        self.max_keys = limit.max_keys
+        self.buckets: OrderedDict[Hashable, _Bucket] = OrderedDict()
+
+    def acquire(self, request: Any) -> bool:
+        """
+        Take a token for the request.
+
+        Returns:
+            False if the request is over the limit.
+        """
+        key = self.key(request) if self.key is not None else None
+        now = monotonic()
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self.buckets.popitem(last=False)
+            bucket = self.buckets[key] = _Bucket(self.capacity, now)
+        else:
+            self.buckets.move_to_end(key)
+            bucket.tokens = min(
+                self.capacity, bucket.tokens + (now - bucket.updated) * self.rate
+            )
+            bucket.updated = now
+
+        if bucket.tokens < 1:
+            return False
+        bucket.tokens -= 1
+        return True
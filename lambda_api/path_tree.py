@@ -0,0 +1,184 @@
+import re
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+PARAM_PATTERN = re.compile(r"^\{(?P<name>[A-Za-z_]\w*)(?::(?P<converter>\w+))?\}$")
+CATCH_ALL_CONVERTER = "path"
+
+
+def _convert_str(segment: str) -> str:
+    if not segment:
+        raise ValueError("Empty path segment")
+    return segment
+
+
+def _convert_int(segment: str) -> int:
+    if not segment.isascii() or not segment.isdecimal():
+        raise ValueError(f"Not an integer: {segment}")
+    return int(segment)
+
+
+CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "str": _convert_str,
+    "int": _convert_int,
+}
+
+
+def is_path_template(path: str) -> bool:
+    """
+    Check if the path contains parameters, e.g. `/users/{id:int}`.
+    """
+    return "{" in path
+
+
+def path_param_names(path: str) -> list[str]:
+    """
+    Get the parameter names of the path template, e.g. `/users/{id:int}` -> `["id"]`.
+    """
+    return re.findall(r"\{([A-Za-z_]\w*)(?::\w+)?\}", path)
+
+
+def openapi_path(path: str) -> str:
+    """
+    Convert the path template to the OpenAPI format, e.g. `/users/{id:int}` -> `/users/{id}`.
+    """
+    return re.sub(r"\{(\w+):\w+\}", r"{\1}", path)
+
+
+class _Node(Generic[T]):
+    __slots__ = ("static", "param", "catch_all", "value")
+
+    def __init__(self):
+        self.static: dict[str, _Node[T]] = {}
+        # (name, converter name, converter, child node)
+        self.param: tuple[str, str, Callable[[str], Any], _Node[T]] | None = None
+        # (name, value)
+        self.catch_all: tuple[str, T] | None = None
+        self.value: T | None = None
+
+
+class PathTree(Generic[T]):
+    """
+    Segment trie for the path templates with parameters.
+
+    Supported segments:
+        - `static` - matched exactly, has the highest priority
+        - `{name}` or `{name:str}` - any non-empty segment
+        - `{name:int}` - a segment made of digits, converted to int
+        - `{name:path}` - the rest of the path, must be the last segment
+
+    The lookup time depends only on the path length, not on the number of routes.
+    """
+
+    def __init__(self):
+        self.root: _Node[T] = _Node()
+
+    def __bool__(self) -> bool:
+        node = self.root
+        return bool(node.static or node.param or node.catch_all)
+
+    def insert(self, template: str, value: T):
+        """
+        Add the path template to the tree.
+
+        Raises:
+            ValueError: If the template is malformed or conflicts with another one.
+        """
+        segments = template.strip("/").split("/")
+        names = set()
+        node = self.root
+
+        for i, segment in enumerate(segments):
+            match = PARAM_PATTERN.match(segment)
+            if not match:
+                if "{" in segment or "}" in segment:
+                    raise ValueError(
+                        f"Malformed path segment {segment!r} in {template}"
+                    )
+
+                node = node.static.setdefault(segment, _Node())
+                continue
+
+            name = match["name"]
+            converter = match["converter"] or "str"
+            if name in names:
+                raise ValueError(f"Duplicate path parameter {name!r} in {template}")
+            names.add(name)
+
+            if converter == CATCH_ALL_CONVERTER:
+                if i != len(segments) - 1:
+                    raise ValueError(
+                        f"Catch-all parameter {name!r} must be the last segment"
+                        f" in {template}"
+                    )
+                if node.catch_all is not None:
+                    raise ValueError(
+                        f"Path {template} conflicts with another route"
+                        f" at the catch-all parameter {name!r}"
+                    )
+
+                node.catch_all = (name, value)
+                return
+
+            if converter not in CONVERTERS:
+                raise ValueError(
+                    f"Unknown path parameter type {converter!r} in {template}"
+                )
+
+            if node.param is None:
+                node.param = (name, converter, CONVERTERS[converter], _Node())
+            elif node.param[:2] != (name, converter):
+                existing_name, existing_converter = node.param[:2]
+                raise ValueError(
+                    f"Path parameter {{{name}:{converter}}} in {template} conflicts"
+                    f" with {{{existing_name}:{existing_converter}}} of another route"
+                )
+            node = node.param[3]
+
+        if node.value is not None:
+            raise ValueError(f"Path {template} conflicts with another route")
+        node.value = value
+
+    def lookup(self, path: str) -> tuple[T, dict[str, Any]] | None:
+        """
+        Find the value of the path template matching the path.
+
+        Returns:
+            The value and the path parameters, or None if nothing matches.
+        """
+        params: dict[str, Any] = {}
+        value = self._match(self.root, path.strip("/").split("/"), 0, params)
+        if value is None:
+            return None
+        return value, params
+
+    def _match(
+        self, node: _Node[T], segments: list[str], i: int, params: dict[str, Any]
+    ) -> T | None:
+        if i == len(segments):
+            return node.value
+
+        segment = segments[i]
+
+        if (child := node.static.get(segment)) is not None:
+            if (value := self._match(child, segments, i + 1, params)) is not None:
+                return value
+
+        if node.param is not None:
+            name, _, convert, child = node.param
+            try:
+                converted = convert(segment)
+            except ValueError:
+                pass
+            else:
+                if (value := self._match(child, segments, i + 1, params)) is not None:
+                    params[name] = converted
+                    return value
+
+        if node.catch_all is not None:
+            name, value = node.catch_all
+            params[name] = "/".join(segments[i:])
+            return value
+
+        return None
@@ -1,15 +1,18 @@
 import logging
 from typing import Callable, Iterable
 
-from lambda_api.base import AbstractRouter, RouteParams
+from lambda_api.base import AbstractRouter, Middleware, RouteParams
 from lambda_api.schema import Method
 
 logger = logging.getLogger(__name__)
 
 
 class Router(AbstractRouter):
-    def __init__(self, tags: list[str] | None = None):
+    def __init__(
+        self, tags: list[str] | None = None, middlewares: list[Middleware] | None = None
+    ):
         self.tags = tags or []
+        self.middlewares = middlewares or []
         self.routes: dict[str, dict[Method, tuple[Callable, RouteParams]]] = {}
         self.routers: set[tuple[str, AbstractRouter]] = set()
 
@@ -29,6 +32,21 @@ class Router(AbstractRouter):
     def add_router(self, prefix: str, router: AbstractRouter):
         self.routers.add(("/" + prefix.lstrip("/") if prefix else "", router))
 
+    def add_middleware(self, middleware: Middleware) -> Middleware:
+        """
+        Add a middleware to all the routes of the router, including the nested ones.
+        """
+        self.middlewares.append(middleware)
+        return middleware
+
+    def with_middlewares(self, config: RouteParams) -> RouteParams:
+        if not self.middlewares:
+            return config
+        return {
+            **config,
+            "middlewares": [*self.middlewares, *config.get("middlewares", ())],
+        }
+
     def get_routes(
         self, prefix: str
     ) -> Iterable[tuple[Callable, str, Method, RouteParams]]:
@@ -36,7 +54,8 @@ class Router(AbstractRouter):
 
         for path, methods in self.routes.items():
             for method, (fn, config) in methods.items():
-                yield fn, prefix + path, method, config
+                yield fn, prefix + path, method, self.with_middlewares(config)
 
         for router_prefix, router in self.routers:
-            yield from router.get_routes(prefix + router_prefix)
+            for fn, path, method, config in router.get_routes(prefix + router_prefix):
+                yield fn, path, method, self.with_middlewares(config)
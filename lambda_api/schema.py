@@ -1,7 +1,8 @@
 from enum import StrEnum
-from typing import Any, ClassVar, NamedTuple
+from time import monotonic
+from typing import Any, Callable, ClassVar, NamedTuple, Type, get_origin
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, create_model
 
 
 class Method(StrEnum):
@@ -35,7 +36,90 @@ class Request(BaseModel):
     params: dict[str, Any]
     body: Any
     provider_data: Any
+    path_params: dict[str, Any] = {}
+    deadline: float | None = None
+    """`time.monotonic()` time the request must be answered by, if it's limited."""
+
+    def remaining_time(self) -> float | None:
+        """
+        Seconds left until the deadline, to budget the downstream calls.
+        """
+        return None if self.deadline is None else self.deadline - monotonic()
 
 
 class BearerAuthRequest(Request):
     request_config = RequestConfigBase(auth_name="BearerAuth")
+
+
+def make_request_loader(request_cls: Type[Request]) -> Callable[[Any], Request]:
+    """
+    Build a function creating the request model from the parsed request.
+
+    Only the fields the subclass customizes (new fields, changed types or defaults,
+    field validators) are validated, the rest is passed through as is,
+    except that the mappings of the dict fields are converted to dicts.
+    Subclasses with model validators or a custom config are fully validated.
+    """
+    decorators = request_cls.__pydantic_decorators__
+    if (
+        request_cls.model_config != Request.model_config
+        or decorators.model_validators
+        or decorators.root_validators
+        or decorators.validators
+    ):
+        return request_cls.model_validate
+
+    base_fields = Request.model_fields
+    validated_fields = {
+        field
+        for decorator in decorators.field_validators.values()
+        for field in decorator.info.fields
+    }
+    if "*" in validated_fields:
+        return request_cls.model_validate
+
+    for name, field in request_cls.model_fields.items():
+        base = base_fields.get(name)
+        if base is None or (field.annotation, field.default, field.metadata) != (
+            base.annotation,
+            base.default,
+            base.metadata,
+        ):
+            validated_fields.add(name)
+
+    passed_fields = [name for name in base_fields if name not in validated_fields]
+    # the adapters may parse e.g. the query params into the lazy mappings,
+    # which the dict fields must not keep, as they don't serialize
+    dict_fields = [
+        name
+        for name in passed_fields
+        if get_origin(base_fields[name].annotation) is dict
+    ]
+    construct_headers = "headers" in passed_fields
+    if construct_headers:
+        passed_fields.remove("headers")
+
+    fields_model = None
+    if validated_fields:
+        fields_model = create_model(  # type: ignore
+            f"{request_cls.__name__}Fields",
+            __config__=ConfigDict(from_attributes=True),
+            **{
+                name: (field.annotation, field)
+                for name, field in request_cls.model_fields.items()
+                if name in validated_fields
+            },
+        )
+
+    def load(request: Any) -> Request:
+        data = {name: getattr(request, name) for name in passed_fields}
+        for name in dict_fields:
+            if not isinstance(value := data[name], dict):
+                data[name] = dict(value)
+        if construct_headers:
+            data["headers"] = Headers.model_construct(**request.headers)
+        if fields_model:
+            data.update(fields_model.model_validate(request).__dict__)
+        return request_cls.model_construct(**data)
+
+    return load
@@ -0,0 +1,140 @@
+"""
+Cold start report of an app: import time per module, route registration time
+and route compile time.
+
+Usage: python -m lambda_api.startup_report module:app [--top 20] [--budget-ms 300]
+
+The app is imported in a fresh interpreter, so the report matches a cold start.
+With `--budget-ms`, the tool exits with code 1 if the import and the compilation
+take longer in total, to hold the cold start budget in CI.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Any, NamedTuple
+
+from lambda_api.utils import json_loads
+
+PROBE = """
+import json
+import sys
+from importlib import import_module
+from time import perf_counter
+
+start = perf_counter()
+from lambda_api.app import LambdaAPI
+framework_time = perf_counter() - start
+
+registration = [0.0, 0]
+decorate_route = LambdaAPI.decorate_route
+
+def timed_decorate_route(*args, **kwargs):
+    start = perf_counter()
+    try:
+        return decorate_route(*args, **kwargs)
+    finally:
+        registration[0] += perf_counter() - start
+        registration[1] += 1
+
+LambdaAPI.decorate_route = timed_decorate_route
+
+module_name, _, attr = sys.argv[1].partition(":")
+start = perf_counter()
+module = import_module(module_name)
+app_time = perf_counter() - start
+
+LambdaAPI.decorate_route = decorate_route
+app = getattr(module, attr or "app")
+
+start = perf_counter()
+compile_timings = app.compile()
+compile_time = perf_counter() - start
+
+print(json.dumps({
+    "framework_import": framework_time,
+    "app_import": app_time,
+    "registration": registration[0],
+    "route_count": registration[1],
+    "compile": compile_time,
+    "routes": sorted(
+        ([method + " " + (path or "/"), t] for (path, method), t in compile_timings.items()),
+        key=lambda item: -item[1],
+    ),
+}))
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """
+    Parse the `python -X importtime` output.
+    """
+    result = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        result.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return result
+
+
+def collect(target: str) -> tuple[dict[str, Any], list[ImportTime]]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, target],
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Failed to import {target}:\n{process.stderr}")
+
+    return json_loads(process.stdout), parse_importtime(process.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("target", help="The app to inspect, as `module:attribute`")
+    parser.add_argument("--top", type=int, default=20, help="Modules to show")
+    parser.add_argument(
+        "--budget-ms", type=float, help="Fail if the startup takes longer"
+    )
+    args = parser.parse_args()
+
+    report, imports = collect(args.target)
+
+    print(f"Slowest imports (top {args.top} by self time):")
+    print(f"{'self ms':>9} {'total ms':>9}  module")
+    for item in sorted(imports, key=lambda item: -item.self_us)[: args.top]:
+        print(
+            f"{item.self_us / 1000:9.2f} {item.cumulative_us / 1000:9.2f}"
+            f"  {item.module}"
+        )
+
+    print("\nSlowest routes to compile:")
+    for route, seconds in report["routes"][: args.top]:
+        print(f"{seconds * 1000:9.2f}  {route}")
+
+    total = report["framework_import"] + report["app_import"] + report["compile"]
+    print(
+        "\n"
+        f"lambda_api import:  {report['framework_import'] * 1000:9.2f} ms\n"
+        f"app import:         {report['app_import'] * 1000:9.2f} ms\n"
+        f"  route registration: {report['registration'] * 1000:7.2f} ms"
+        f" ({report['route_count']} routes)\n"
+        f"route compilation:  {report['compile'] * 1000:9.2f} ms\n"
+        f"total:              {total * 1000:9.2f} ms"
+    )
+
+    if args.budget_ms is not None and total * 1000 > args.budget_ms:
+        print(f"\nThe startup budget of {args.budget_ms} ms is exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
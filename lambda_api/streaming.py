@@ -0,0 +1,158 @@
+"""
+Streamed responses of the async generator handlers.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from enum import StrEnum
+from time import monotonic
+from typing import Any, AsyncIterator, Callable, Type
+
+from pydantic import BaseModel
+
+from lambda_api.error import GatewayTimeoutError
+from lambda_api.utils import json_dumps_bytes, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+class StreamFormat(StrEnum):
+    """
+    How the items yielded by the handler are sent.
+    """
+
+    NDJSON = "ndjson"
+    """A JSON document per line, `application/x-ndjson`."""
+    JSON = "json"
+    """A single JSON array, sent item by item."""
+
+
+STREAM_CONTENT_TYPES = {
+    StreamFormat.NDJSON: "application/x-ndjson",
+    StreamFormat.JSON: "application/json",
+}
+
+PRELUDE_DELIMITER = b"\x00" * 8
+"""Separates the JSON prelude (status and headers) from the Lambda streamed body."""
+
+
+async def encode_stream(
+    items: AsyncIterator[Any], model: Type[BaseModel] | None, format: StreamFormat
+) -> AsyncIterator[bytes]:
+    """
+    Validate and serialize the items one by one, so only the current one is in memory.
+    The errors are raised from the iteration, after the response has started.
+    """
+    serializer = model.__pydantic_serializer__ if model is not None else None
+
+    def encode(item: Any) -> bytes:
+        if model is None:
+            return json_dumps_bytes(item)
+        if not isinstance(item, model):
+            item = model.model_validate(item)
+        return serializer.to_json(item)  # type: ignore
+
+    if format == StreamFormat.NDJSON:
+        async for item in items:
+            yield encode(item) + b"\n"
+        return
+
+    separator = b"["
+    async for item in items:
+        yield separator + encode(item)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+async def close_stream(stream: AsyncIterator[bytes]):
+    """
+    Close the streamed body if it supports it, e.g. an async generator
+    the transport stopped reading.
+    """
+    if (aclose := getattr(stream, "aclose", None)) is not None:
+        await aclose()
+
+
+class BoundedStream:
+    """
+    Streamed body produced within the request deadline. `on_close` is called once,
+    when the stream ends, fails or is closed, even if it's never iterated.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[bytes],
+        deadline: float | None,
+        on_close: Callable[[], Any],
+    ):
+        self.stream = aiter(stream)
+        self.deadline = deadline
+        self.on_close: Callable[[], Any] | None = on_close
+
+    def __aiter__(self) -> "BoundedStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self.on_close is None:
+            raise StopAsyncIteration
+        try:
+            if self.deadline is None:
+                return await anext(self.stream)
+            async with asyncio.timeout(self.deadline - monotonic()) as scope:
+                return await anext(self.stream)
+        except TimeoutError:
+            await self.aclose()
+            if self.deadline is None or not scope.expired():
+                raise
+            logger.warning("Streamed response timed out")
+            raise GatewayTimeoutError() from None
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        if self.on_close is None:
+            return
+        on_close, self.on_close = self.on_close, None
+        try:
+            await close_stream(self.stream)
+        finally:
+            on_close()
+
+
+class ResponseStream(ABC):
+    """
+    Lambda response stream, e.g. the one of a custom runtime posting the response
+    with `Lambda-Runtime-Function-Response-Mode: streaming`.
+    """
+
+    @abstractmethod
+    async def write(self, data: bytes): ...
+
+    @abstractmethod
+    async def close(self): ...
+
+
+class LocalResponseStream(ResponseStream):
+    """
+    Stand-in of the Lambda response stream keeping the written chunks,
+    to run the streaming handlers locally and in the tests.
+    """
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.closed = False
+
+    async def write(self, data: bytes):
+        self.chunks.append(data)
+
+    async def close(self):
+        self.closed = True
+
+    def read(self) -> tuple[dict[str, Any], bytes]:
+        """
+        Split the written data into the HTTP response prelude and the body.
+        """
+        prelude, _, body = b"".join(self.chunks).partition(PRELUDE_DELIMITER)
+        return json_loads(prelude), body
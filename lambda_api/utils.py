@@ -1,4 +1,7 @@
+from abc import abstractmethod
+from hashlib import blake2b
 from json.decoder import JSONDecodeError
+from typing import Any, Iterator, Mapping
 
 import orjson
 
@@ -28,6 +31,12 @@ def json_dumps(data, indent=False) -> str:
     ).decode()
 
 
+def json_dumps_bytes(data) -> bytes:
+    return orjson.dumps(
+        data, option=ORJSON_DEFAULT_OPTIONS, default=_json_arbitrary_serializer
+    )
+
+
 def json_loads(data: str):
     return orjson.loads(data)
 
@@ -61,3 +70,138 @@ def json_decode_error_fragment(e: JSONDecodeError) -> str:
         ]
 
     return "".join(fragment)
+
+
+def make_etag(body: bytes | str) -> str:
+    """
+    Make a strong ETag from the response body.
+    """
+    if isinstance(body, str):
+        body = body.encode()
+    return '"' + blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check the `If-None-Match` header value against the ETag, with the weak comparison.
+    """
+    if if_none_match.strip() == "*":
+        return True
+
+    etag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class LazyMapping(Mapping[str, Any]):
+    """
+    Read-only mapping built from the raw provider data on the first access and cached,
+    so the requests that never read it don't pay for the conversion.
+    """
+
+    __slots__ = ("raw", "_data")
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self._data: dict[str, Any] | None = None
+
+    @abstractmethod
+    def load(self) -> dict[str, Any]:
+        """
+        Convert the raw data into the mapping contents.
+        """
+
+    @property
+    def data(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = self.load()
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def __repr__(self) -> str:
+        return repr(self.data)
+
+
+class LazyHeaders(LazyMapping):
+    """
+    Provider's headers with the names normalized
+    to the attribute-like form: `X-Api-Key` -> `x_api_key`.
+    """
+
+    __slots__ = ()
+
+    def load(self) -> dict[str, Any]:
+        return {k.lower().replace("-", "_"): v for k, v in self.raw.items()}
+
+
+class LazyMultiValueHeaders(LazyHeaders):
+    """
+    Multi-value headers (`name -> list of values`) joined into single values.
+    """
+
+    __slots__ = ()
+
+    def load(self) -> dict[str, Any]:
+        return {k.lower().replace("-", "_"): ", ".join(v) for k, v in self.raw.items()}
+
+
+class LazyASGIHeaders(LazyHeaders):
+    """
+    ASGI headers (a list of `(name, value)` byte pairs) decoded and normalized.
+    Repeated headers are joined into a single value.
+    """
+
+    __slots__ = ()
+
+    def load(self) -> dict[str, Any]:
+        headers: dict[str, Any] = {}
+        for name, value in self.raw:
+            key = name.decode("latin-1").lower().replace("-", "_")
+            value = value.decode("latin-1")
+            if key in headers:
+                separator = "; " if key == "cookie" else ", "
+                value = headers[key] + separator + value
+            headers[key] = value
+        return headers
+
+
+class LazyQueryParams(LazyMapping):
+    """
+    Query parameters parsed from the raw query string. The last value of a key wins.
+    """
+
+    __slots__ = ()
+
+    def load(self) -> dict[str, Any]:
+        from urllib.parse import parse_qsl
+
+        return dict(parse_qsl(self.raw, keep_blank_values=True))
+
+
+class LazyEncodedQueryParams(LazyMapping):
+    """
+    Query parameters with URL-encoded names and values, as ALB passes them.
+    Multi-value parameters (`name -> list of values`) take the last value.
+    """
+
+    __slots__ = ()
+
+    def load(self) -> dict[str, Any]:
+        from urllib.parse import unquote_plus
+
+        return {
+            unquote_plus(k): unquote_plus(v[-1] if isinstance(v, list) else v)
+            for k, v in self.raw.items()
+        }
@@ -0,0 +1,52 @@
+"""
+Encoding of the validation errors into the 400 responses.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from pydantic import ValidationError
+
+from lambda_api.utils import json_dumps_bytes
+
+
+@dataclass(slots=True)
+class ValidationErrorConfig:
+    """
+    What the validation error responses include.
+    """
+
+    max_errors: int | None = 20
+    """Maximum number of the reported errors, None reports all of them."""
+    include_input: bool = True
+    """Echo the invalid input values, which may be large."""
+
+
+def encode_validation_error(
+    error: ValidationError, config: ValidationErrorConfig
+) -> bytes:
+    """
+    Encode the validation error into the JSON response body
+    `{"error": [{"type", "loc", "msg", "input", "ctx"}, ...]}` in one pass.
+    If there are more errors than reported, `error_count` holds their total number.
+    """
+    errors = error.errors(include_url=False, include_input=config.include_input)
+    count = len(errors)
+    if config.max_errors is not None and count > config.max_errors:
+        errors = errors[: config.max_errors]
+
+    for item in errors:
+        if "input" in item:
+            item["input"] = _plain_input(item["input"])
+
+    if count > len(errors):
+        return json_dumps_bytes({"error": errors, "error_count": count})
+    return json_dumps_bytes({"error": errors})
+
+
+def _plain_input(value: Any) -> Any:
+    # the whole-object inputs may be the lazy mappings of the adapters
+    # (e.g. the headers missing a required one), which orjson can't encode
+    if isinstance(value, Mapping) and not isinstance(value, dict):
+        return dict(value)
+    return value
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.adapters import ASGIAdapter
+from lambda_api.app import LambdaAPI
+from lambda_api.schema import Headers, Request
+
+
+class EchoParams(BaseModel):
+    delay: float = 0
+
+
+class EchoBody(BaseModel):
+    message: str
+
+
+class EchoHeaders(Headers):
+    x_request_id: str
+
+
+class EchoRequest(Request):
+    headers: EchoHeaders  # type: ignore
+
+
+@pytest.fixture
+def asgi_app():
+    app = LambdaAPI()
+
+    @app.post("/echo")
+    async def echo(params: EchoParams, body: EchoBody, request: EchoRequest) -> dict:
+        await asyncio.sleep(params.delay)
+        return {"message": body.message, "id": request.headers.x_request_id}
+
+    return ASGIAdapter(app)
+
+
+def make_scope(method: str, path: str, query: bytes = b"", headers=()):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": list(headers),
+    }
+
+
+async def call(app: ASGIAdapter, scope: dict, chunks: list[bytes] = [b""]):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_asgi_request_response(asgi_app: ASGIAdapter):
+    scope = make_scope(
+        "POST",
+        "/echo/",
+        headers=[(b"x-request-id", b"42"), (b"content-type", b"application/json")],
+    )
+
+    sent = await call(asgi_app, scope, [b'{"message": ', b'"hello"}'])
+
+    assert sent == [
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        },
+        {"type": "http.response.body", "body": b'{"message":"hello","id":"42"}'},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_asgi_errors(asgi_app: ASGIAdapter):
+    sent = await call(asgi_app, make_scope("GET", "/missing"))
+    assert sent[0]["status"] == 404
+    assert sent[1]["body"] == b'{"error":"Not Found"}'
+
+    sent = await call(asgi_app, make_scope("HEAD", "/echo"))
+    assert sent[0]["status"] == 405
+
+
+@pytest.mark.asyncio
+async def test_asgi_concurrent_requests(asgi_app: ASGIAdapter):
+    async def request(i: int):
+        scope = make_scope(
+            "POST",
+            "/echo",
+            query=f"delay={0.001 * (i % 5)}".encode(),
+            headers=[(b"x-request-id", str(i).encode())],
+        )
+        sent = await call(asgi_app, scope, [f'{{"message": "m{i}"}}'.encode()])
+        return sent[1]["body"]
+
+    results = await asyncio.gather(*(request(i) for i in range(50)))
+
+    assert results == [f'{{"message":"m{i}","id":"{i}"}}'.encode() for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_asgi_lifespan(asgi_app: ASGIAdapter):
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app({"type": "lifespan"}, receive, send)
+
+    assert sent == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+    assert asgi_app.app.compiled
@@ -1,11 +1,12 @@
 from unittest.mock import AsyncMock
 
 import pytest
+from pydantic import BaseModel
 
 from lambda_api.adapters import AWSAdapter
 from lambda_api.app import LambdaAPI, ParsedRequest, Response
-from lambda_api.schema import Method
-from lambda_api.utils import json_dumps
+from lambda_api.schema import Headers, Method, Request
+from lambda_api.utils import LazyHeaders, json_dumps, json_loads
 
 
 @pytest.fixture
@@ -84,3 +85,98 @@ async def test_request_root_and_empty_paths(
 
     assert adapter_parsed_root.path == "/"
     assert adapter_parsed_empty_path.path == ""
+
+
+def test_raw_response_body_is_not_reencoded(mock_adapter: AWSAdapter):
+    response = Response(status=200, body=b'{"message":"test name"}', raw=True)
+
+    assert mock_adapter.prepare_response(response) == {
+        "statusCode": 200,
+        "body": '{"message":"test name"}',
+        "headers": {"Content-Type": "application/json"},
+    }
+
+
+class ExampleBody(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def body_adapter():
+    app = LambdaAPI()
+
+    @app.post("/example")
+    async def post_example(body: ExampleBody) -> str:
+        return body.name
+
+    @app.post("/no-body")
+    async def post_no_body() -> str:
+        return "ok"
+
+    return AWSAdapter(app)
+
+
+def make_event(path: str, body: str | None):
+    return {"httpMethod": "POST", "pathParameters": {"proxy": path}, "body": body}
+
+
+@pytest.mark.asyncio
+async def test_request_body_validated_from_raw_json(body_adapter: AWSAdapter):
+    response = await body_adapter.run(make_event("/example", '{"name": "test"}'))
+    assert (response["statusCode"], response["body"]) == (200, '"test"')
+
+    response = await body_adapter.run(make_event("/example", '{"name": 1}'))
+    assert response["statusCode"] == 400
+
+
+@pytest.mark.asyncio
+async def test_request_invalid_json(body_adapter: AWSAdapter):
+    response = await body_adapter.run(make_event("/example", '{"name": "test}'))
+
+    assert response["statusCode"] == 400
+    assert json_loads(response["body"])["error"].startswith("Invalid JSON:\n")
+
+
+@pytest.mark.asyncio
+async def test_request_body_not_parsed_when_unused(body_adapter: AWSAdapter):
+    response = await body_adapter.run(make_event("/no-body", "{invalid"))
+    assert (response["statusCode"], response["body"]) == (200, '"ok"')
+
+    response = await body_adapter.run(make_event("/missing", "{invalid"))
+    assert response["statusCode"] == 404
+
+
+class CustomHeaders(Headers):
+    x_custom_header: str
+
+
+class CustomRequest(Request):
+    headers: CustomHeaders  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_request_headers_are_lazy():
+    app = LambdaAPI()
+
+    @app.get("/headers")
+    async def get_headers(request: CustomRequest) -> str:
+        return request.headers.x_custom_header
+
+    event = {
+        "httpMethod": "GET",
+        "pathParameters": {"proxy": "/headers"},
+        "headers": {"X-Custom-Header": "value", "Content-Type": "text/plain"},
+        "queryStringParameters": {"a": "2"},
+        "multiValueQueryStringParameters": {"a": ["1", "2"], "b": ["3"]},
+    }
+    adapter = AWSAdapter(app)
+    request = adapter.parse_request(event)
+
+    assert isinstance(request.headers, LazyHeaders)
+    assert request.headers._data is None
+    assert request.headers == {"x_custom_header": "value", "content_type": "text/plain"}
+    assert request.params == {"a": "2", "b": ["3"]}
+    assert event["multiValueQueryStringParameters"] == {"a": ["1", "2"], "b": ["3"]}
+
+    response = await adapter.run(event)
+    assert (response["statusCode"], response["body"]) == (200, '"value"')
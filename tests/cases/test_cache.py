@@ -0,0 +1,217 @@
+import gzip
+from unittest.mock import patch
+
+import pytest
+
+from lambda_api.app import LambdaAPI, Response
+from lambda_api.cache import ResponseCache
+from lambda_api.compression import CompressionConfig, compress
+from lambda_api.schema import Method
+from lambda_api.utils import etag_matches, make_etag
+from tests.tools.events import make_request
+
+
+def test_cache_lru_and_size_limits():
+    cache = ResponseCache(ttl=60, max_entries=2, max_bytes=10)
+
+    cache.set("a", "A", 4)
+    cache.set("b", "B", 4)
+    assert cache.get("a") == "A"
+
+    cache.set("c", "C", 4)  # too many bytes and entries, "b" is the LRU one
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+    cache.set("d", "D", 11)  # larger than the whole cache
+    assert cache.get("d") is None
+
+    assert cache.stats() == {"hits": 3, "misses": 2, "entries": 2, "bytes": 8}
+
+
+def test_cache_ttl():
+    cache = ResponseCache(ttl=10)
+
+    with patch("lambda_api.cache.monotonic", return_value=100):
+        cache.set("a", "A", 1)
+    with patch("lambda_api.cache.monotonic", return_value=109):
+        assert cache.get("a") == "A"
+    with patch("lambda_api.cache.monotonic", return_value=110):
+        assert cache.get("a") is None
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_key():
+    cache = ResponseCache(ttl=10, vary_headers=["Accept-Language"])
+
+    key = cache.make_key("/a", {"x": "1", "y": ["2"]}, {"accept_language": "en"})
+    assert key == cache.make_key(
+        "/a", {"y": ["2"], "x": "1"}, {"accept_language": "en", "other": "1"}
+    )
+    assert key != cache.make_key("/a", {"x": "1"}, {"accept_language": "en"})
+    assert key != cache.make_key("/a", {"x": "1", "y": ["2"]}, {})
+
+
+@pytest.fixture
+def app():
+    app = LambdaAPI()
+    app.calls = 0
+
+    @app.get("/items", cache_ttl=60, cache_vary_headers=["X-Tenant"])
+    async def get_items() -> list[int]:
+        app.calls += 1
+        return [app.calls]
+
+    @app.post("/items", cache_ttl=60)
+    async def post_items() -> None:
+        app.calls += 1
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_cached_route(app: LambdaAPI):
+    first = Response(status=200, body=b"[1]", raw=True)
+
+    assert await app.run(make_request("/items")) == first
+    assert await app.run(make_request("/items")) == first
+    assert await app.run(make_request("/items", params={"a": "1"})) == Response(
+        status=200, body=b"[2]", raw=True
+    )
+    assert await app.run(make_request("/items", headers={"x_tenant": "t"})) == Response(
+        status=200, body=b"[3]", raw=True
+    )
+    assert app.calls == 3
+
+    app.invalidate_cache("/items")
+    assert await app.run(make_request("/items")) == Response(
+        status=200, body=b"[4]", raw=True
+    )
+
+    assert app.route_table["/items"][Method.GET].cache.stats() == {
+        "hits": 1,
+        "misses": 4,
+        "entries": 1,
+        "bytes": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_only_get_routes_are_cached(app: LambdaAPI):
+    await app.run(make_request("/items", Method.POST))
+    await app.run(make_request("/items", Method.POST))
+
+    assert app.calls == 2
+    assert app.route_table["/items"][Method.POST].cache is None
+
+
+@pytest.mark.asyncio
+async def test_cached_compressed_variants():
+    app = LambdaAPI(compression=CompressionConfig(min_size=1))
+
+    @app.get("/items", cache_ttl=60)
+    async def get_items() -> list[int]:
+        return list(range(100))
+
+    with patch("lambda_api.app.compress", wraps=compress) as compress_mock:
+        gzipped = await app.run(
+            make_request("/items", headers={"accept_encoding": "gzip"})
+        )
+        assert await app.run(
+            make_request("/items", headers={"accept_encoding": "gzip"})
+        ) == (gzipped)
+        assert compress_mock.call_count == 1
+
+        plain = await app.run(make_request("/items"))
+        assert await app.run(make_request("/items")) == plain
+        assert compress_mock.call_count == 1
+
+    assert gzipped.headers == {"Vary": "Accept-Encoding", "Content-Encoding": "gzip"}
+    assert gzip.decompress(gzipped.body) == plain.body
+    assert plain.headers == {"Vary": "Accept-Encoding"}
+    assert app.route_table["/items"][Method.GET].cache.stats()["entries"] == 2
+
+
+@pytest.mark.parametrize(
+    "if_none_match, etag, expected",
+    [
+        ('"abc"', '"abc"', True),
+        ('"x", W/"abc"', '"abc"', True),
+        ('"abc"', 'W/"abc"', True),
+        ("*", '"abc"', True),
+        ('"abcd"', '"abc"', False),
+    ],
+)
+def test_etag_matches(if_none_match: str, etag: str, expected: bool):
+    assert etag_matches(if_none_match, etag) == expected
+
+
+@pytest.mark.asyncio
+async def test_etag_and_cache_control():
+    app = LambdaAPI(etag=True, compression=CompressionConfig(min_size=1))
+
+    @app.get("/items", cache_control="public, max-age=60")
+    async def get_items() -> list[int]:
+        return [1, 2, 3]
+
+    @app.get("/no-etag", etag=False)
+    async def get_no_etag() -> list[int]:
+        return [1, 2, 3]
+
+    response = await app.run(make_request("/items"))
+    etag = make_etag(b"[1,2,3]")
+    assert response.status == 200
+    assert response.headers == {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=60",
+        "Vary": "Accept-Encoding",
+    }
+
+    response = await app.run(make_request("/items", headers={"if_none_match": etag}))
+    assert response == Response(
+        status=304,
+        body=b"",
+        headers={
+            "ETag": etag,
+            "Cache-Control": "public, max-age=60",
+            "Vary": "Accept-Encoding",
+        },
+        raw=True,
+    )
+
+    response = await app.run(
+        make_request("/items", headers={"if_none_match": '"other"'})
+    )
+    assert response.status == 200
+
+    response = await app.run(
+        make_request("/items", headers={"accept_encoding": "gzip"})
+    )
+    assert response.headers["ETag"] == "W/" + etag
+    assert response.headers["Content-Encoding"] == "gzip"
+
+    request = make_request("/items", headers={"if_none_match": etag})
+    request.path = "/no-etag"
+    response = await app.run(request)
+    assert response.status == 200
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_shared_response_is_not_changed():
+    app = LambdaAPI(etag=True, compression=CompressionConfig(min_size=1))
+    shared = Response(status=200, body=b"[1,2,3]", raw=True)
+
+    @app.get("/items")
+    async def get_items() -> Response:
+        return shared
+
+    gzipped = await app.run(make_request("/items", headers={"accept_encoding": "gzip"}))
+    plain = await app.run(make_request("/items"))
+
+    assert gzip.decompress(gzipped.body) == b"[1,2,3]"
+    assert gzipped.headers["ETag"] == "W/" + make_etag(b"[1,2,3]")
+    assert plain.body == b"[1,2,3]"
+    assert plain.headers == {"ETag": make_etag(b"[1,2,3]"), "Vary": "Accept-Encoding"}
+    assert shared == Response(status=200, body=b"[1,2,3]", raw=True)
@@ -0,0 +1,71 @@
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from lambda_api.app import CompileMode, LambdaAPI, ParsedRequest, Response
+from lambda_api.schema import Method
+
+
+class DeferredSchema(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    name: str
+
+
+def make_app(compile_mode: CompileMode = CompileMode.LAZY):
+    app = LambdaAPI(prefix="/api", compile_mode=compile_mode)
+
+    @app.get("/example", status=200)
+    async def get_example(params: DeferredSchema) -> str:
+        return params.name
+
+    @app.post("/example")
+    async def post_example(body: DeferredSchema) -> DeferredSchema:
+        return body
+
+    return app
+
+
+def get_templates(app: LambdaAPI):
+    return [
+        route.invoke_tamplate
+        for endpoint in app.route_table.values()
+        for route in endpoint.values()
+    ]
+
+
+def test_compile_builds_all_templates():
+    app = make_app()
+    assert get_templates(app) == [None, None]
+
+    timings = app.compile()
+
+    assert set(timings) == {("/example", Method.GET), ("/example", Method.POST)}
+    assert all(t >= 0 for t in timings.values())
+    assert all(template is not None for template in get_templates(app))
+    assert DeferredSchema.__pydantic_complete__
+    assert app.compiled
+
+
+def test_compile_on_init():
+    app = make_app(CompileMode.INIT)
+    assert all(template is not None for template in get_templates(app))
+
+
+@pytest.mark.asyncio
+async def test_compile_on_first_request():
+    app = make_app(CompileMode.FIRST_REQUEST)
+    assert get_templates(app) == [None, None]
+
+    response = await app.run(
+        ParsedRequest(
+            headers={},
+            path="/example",
+            method=Method.GET,
+            params={"name": "test name"},
+            body={},
+            provider_data={},
+        )
+    )
+
+    assert response == Response(status=200, body=b'"test name"', raw=True)
+    assert all(template is not None for template in get_templates(app))
@@ -0,0 +1,92 @@
+import gzip
+import zlib
+from base64 import b64decode
+
+import pytest
+
+from lambda_api.adapters import AWSAdapter
+from lambda_api.app import LambdaAPI
+from lambda_api.compression import CompressionConfig, negotiate_encoding
+from lambda_api.utils import json_dumps
+from tests.tools.events import make_event
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "gzip"),
+        ("deflate", "deflate"),
+        ("br", None),
+        ("gzip;q=0.5, deflate;q=0.8", "deflate"),
+        ("gzip;q=0, *;q=0.1", "deflate"),
+        ("*", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding: str, expected: str | None):
+    assert negotiate_encoding(accept_encoding, ("gzip", "deflate")) == expected
+
+
+ITEMS = [{"id": i, "name": f"item {i}"} for i in range(200)]
+
+
+@pytest.fixture
+def adapter():
+    app = LambdaAPI(compression=CompressionConfig(min_size=100))
+
+    @app.get("/items")
+    async def get_items() -> list[dict]:
+        return ITEMS
+
+    @app.get("/small")
+    async def get_small() -> str:
+        return "small"
+
+    @app.get("/plain", compression=None)
+    async def get_plain() -> list[dict]:
+        return ITEMS
+
+    return AWSAdapter(app)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [("gzip", gzip.decompress), ("deflate", zlib.decompress)],
+)
+async def test_compressed_response(adapter: AWSAdapter, encoding: str, decompress):
+    response = await adapter.run(
+        make_event("/items", headers={"Accept-Encoding": encoding})
+    )
+
+    assert response["isBase64Encoded"] is True
+    assert response["headers"] == {
+        "Content-Type": "application/json",
+        "Content-Encoding": encoding,
+        "Vary": "Accept-Encoding",
+    }
+    assert decompress(b64decode(response["body"])).decode() == json_dumps(ITEMS)
+
+
+@pytest.mark.asyncio
+async def test_uncompressed_responses(adapter: AWSAdapter):
+    response = await adapter.run(make_event("/items"))
+    assert "isBase64Encoded" not in response
+    assert response["headers"] == {
+        "Content-Type": "application/json",
+        "Vary": "Accept-Encoding",
+    }
+    assert response["body"] == json_dumps(ITEMS)
+
+    response = await adapter.run(
+        make_event("/small", headers={"Accept-Encoding": "gzip"})
+    )
+    assert "isBase64Encoded" not in response
+    assert response["body"] == '"small"'
+
+    response = await adapter.run(
+        make_event("/plain", headers={"Accept-Encoding": "gzip"})
+    )
+    assert "isBase64Encoded" not in response
+    assert response["headers"] == {"Content-Type": "application/json"}
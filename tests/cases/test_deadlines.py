@@ -0,0 +1,103 @@
+import asyncio
+from time import monotonic
+
+import pytest
+
+from lambda_api.adapters import AWSAdapter, SQSAdapter
+from lambda_api.app import LambdaAPI
+from lambda_api.schema import Request
+from lambda_api.utils import json_loads
+from tests.tools.events import make_event
+
+
+class LambdaContext:
+    def __init__(self, remaining_ms: int):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.remaining_ms
+
+
+@pytest.fixture
+def adapter():
+    app = LambdaAPI()
+
+    @app.post("/sleep")
+    async def sleep(request: Request) -> float | None:
+        await asyncio.sleep(0.2)
+        return request.remaining_time()
+
+    @app.post("/remaining")
+    async def remaining(request: Request) -> float | None:
+        return request.remaining_time()
+
+    @app.post("/limited", timeout=0.01)
+    async def limited() -> None:
+        await asyncio.sleep(1)
+
+    @app.post("/timeout-error")
+    async def timeout_error() -> None:
+        raise TimeoutError()
+
+    adapter = AWSAdapter(app)
+    adapter.timeout_margin = 0.1
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_no_deadline(adapter: AWSAdapter):
+    response = await adapter.run(make_event("/remaining", "POST"))
+
+    assert json_loads(response["body"]) is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_from_context(adapter: AWSAdapter):
+    response = await adapter.run(make_event("/remaining", "POST"), LambdaContext(1000))
+
+    assert 0.8 < json_loads(response["body"]) <= 0.9
+
+
+@pytest.mark.asyncio
+async def test_context_deadline_exceeded(adapter: AWSAdapter):
+    start = monotonic()
+    response = await adapter.run(make_event("/sleep", "POST"), LambdaContext(150))
+
+    assert monotonic() - start < 0.15
+    assert response["statusCode"] == 504
+    assert json_loads(response["body"]) == {"error": "Gateway Timeout"}
+
+
+@pytest.mark.asyncio
+async def test_route_timeout(adapter: AWSAdapter):
+    response = await adapter.run(make_event("/limited", "POST"), LambdaContext(60_000))
+
+    assert response["statusCode"] == 504
+
+
+@pytest.mark.asyncio
+async def test_handler_timeout_error_is_not_deadline(adapter: AWSAdapter):
+    response = await adapter.run(
+        make_event("/timeout-error", "POST"), LambdaContext(60_000)
+    )
+
+    assert response["statusCode"] == 500
+
+
+@pytest.mark.asyncio
+async def test_sqs_deadline(adapter: AWSAdapter):
+    sqs_adapter = SQSAdapter(adapter.app)
+    sqs_adapter.timeout_margin = 0.1
+    event = {
+        "Records": [
+            {
+                "messageId": "1",
+                "body": "",
+                "messageAttributes": {"route": {"stringValue": "/sleep"}},
+            }
+        ]
+    }
+
+    response = await sqs_adapter.run(event, LambdaContext(150))
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "1"}]}
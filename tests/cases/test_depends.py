@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.app import LambdaAPI, ParsedRequest, Response
+from lambda_api.depends import Container, DependencyGraph, Depends
+from lambda_api.schema import Method
+from tests.tools.events import make_request
+
+
+class Client:
+    instances = 0
+
+    def __init__(self):
+        Client.instances += 1
+
+
+class Item(BaseModel):
+    name: str
+
+
+@pytest.mark.asyncio
+async def test_dependencies_injected():
+    calls: list[str] = []
+
+    async def get_client() -> Client:
+        await asyncio.sleep(0)
+        return Client()
+
+    def get_user(request: ParsedRequest) -> str:
+        calls.append("user")
+        return request.headers["user"]
+
+    def get_greeting(
+        user: str = Depends(get_user), client: Client = Depends(get_client, "container")
+    ) -> str:
+        return f"hello {user}"
+
+    app = LambdaAPI()
+
+    @app.post("/item")
+    async def post_item(
+        body: Item,
+        client: Client = Depends(get_client, scope="container"),
+        user: str = Depends(get_user),
+        greeting: str = Depends(get_greeting),
+    ) -> str:
+        assert isinstance(client, Client)
+        return f"{greeting}, {user} posted {body.name}"
+
+    Client.instances = 0
+    responses = await asyncio.gather(
+        app.run(
+            make_request("/item", Method.POST, {"user": "a"}, body={"name": "test"})
+        ),
+        app.run(
+            make_request("/item", Method.POST, {"user": "b"}, body={"name": "test"})
+        ),
+    )
+
+    assert responses == [
+        Response(200, b'"hello a, a posted test"', raw=True),
+        Response(200, b'"hello b, b posted test"', raw=True),
+    ]
+    # the request dependency is computed once per request
+    assert calls == ["user", "user"]
+    # the container dependency is created once per app
+    assert Client.instances == 1
+
+
+def test_dependency_graph_errors():
+    def get_user(request: ParsedRequest) -> str:
+        return "user"
+
+    def get_client(user: str = Depends(get_user)) -> Client:
+        return Client()
+
+    def get_value(value: int) -> int:
+        return value
+
+    with pytest.raises(ValueError):
+        DependencyGraph({"client": Depends(get_client, scope="container")})
+
+    with pytest.raises(TypeError):
+        DependencyGraph({"value": Depends(get_value)})
+
+    with pytest.raises(ValueError):
+        DependencyGraph(
+            {"user": Depends(get_user), "other": Depends(get_user, "container")}
+        )
+
+
+@pytest.mark.asyncio
+async def test_container_clear():
+    graph = DependencyGraph({"client": Depends(Client, scope="container")})
+    container = Container()
+
+    first = await graph.resolve(None, container)
+    assert (await graph.resolve(None, container)) == first
+
+    container.clear()
+    assert (await graph.resolve(None, container))["client"] is not first["client"]
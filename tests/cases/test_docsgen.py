@@ -1,9 +1,13 @@
+from pathlib import Path
+
 import pytest
 from pydantic import BaseModel
 
 from lambda_api.app import LambdaAPI
 from lambda_api.docsgen import OpenApiGenerator
 from lambda_api.schema import BearerAuthRequest, Headers, Request
+from lambda_api.utils import json_loads
+from tests.tools.events import make_request
 
 
 class ExampleSchema(BaseModel):
@@ -110,3 +114,76 @@ def test_docsgen_headers(app: LambdaAPI):
         schema["paths"]["/api/example4"]["get"]["parameters"][0]["name"]
         == "X-Custom-Header"
     )
+
+
+class Tag(BaseModel):
+    label: str
+
+
+class TaggedItem(BaseModel):
+    description: str = "A string mentioning $defs"
+    tags: list[Tag]
+
+
+def test_docsgen_refs(app: LambdaAPI):
+    @app.post("/tagged")
+    async def post_tagged(body: TaggedItem) -> TaggedItem: ...
+
+    schema = OpenApiGenerator(app).get_schema()
+    components = schema["components"]["schemas"]
+
+    assert components["TaggedItem"]["properties"]["tags"]["items"] == {
+        "$ref": "#/components/schemas/Tag"
+    }
+    assert "Tag" in components
+    assert "$defs" not in components["TaggedItem"]
+    assert (
+        components["TaggedItem"]["properties"]["description"]["default"]
+        == "A string mentioning $defs"
+    )
+
+
+def test_docsgen_cache(app: LambdaAPI):
+    schema = OpenApiGenerator(app).get_schema()
+    content = OpenApiGenerator(app).get_schema_bytes()
+
+    assert OpenApiGenerator(app).get_schema_bytes() is content
+    assert json_loads(content) == schema
+
+    # the callers get their own copies, the cached document doesn't change
+    schema["info"] = {"title": "Changed"}
+    schema["paths"].clear()
+    assert OpenApiGenerator(app).get_schema() == json_loads(content)
+    assert "info" not in json_loads(OpenApiGenerator(app).get_schema_bytes())
+
+    @app.get("/new")
+    async def new_route() -> None: ...
+
+    new_schema = OpenApiGenerator(app).get_schema()
+    assert new_schema is not schema
+    assert "/api/new" in new_schema["paths"]
+    assert OpenApiGenerator(app).get_schema_bytes() != content
+
+
+@pytest.mark.asyncio
+async def test_openapi_route(app: LambdaAPI):
+    app.add_openapi_route(cache_control="max-age=60")
+
+    response = await app.run(make_request("/openapi.json"))
+
+    assert response.status == 200
+    assert response.body is OpenApiGenerator(app).get_schema_bytes()
+    assert response.headers == {"Cache-Control": "max-age=60"}
+    assert "/api/openapi.json" not in json_loads(response.body)["paths"]
+
+
+@pytest.mark.asyncio
+async def test_openapi_route_from_file(app: LambdaAPI, tmp_path: Path):
+    file = tmp_path / "openapi.json"
+    file.write_bytes(b'{"paths": {}}')
+    app.add_openapi_route("/docs/openapi.json", file=file)
+
+    response = await app.run(make_request("/docs/openapi.json"))
+
+    assert (response.status, response.body) == (200, b'{"paths": {}}')
+    assert app.schema_cache == {}
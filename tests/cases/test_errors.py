@@ -0,0 +1,38 @@
+import pytest
+
+from lambda_api.app import LambdaAPI, ParsedRequest, Response
+from lambda_api.error import APIError, NotFoundError
+from lambda_api.schema import Method
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (NotFoundError(), Response(status=404, body={"error": "Not Found"})),
+        (
+            NotFoundError("Item is gone", status=410),
+            Response(status=410, body={"error": "Item is gone"}),
+        ),
+        (
+            APIError("I'm a teapot", status=418),
+            Response(status=418, body={"error": "I'm a teapot"}),
+        ),
+    ],
+)
+async def test_api_error_status(error: APIError, expected: Response):
+    app = LambdaAPI()
+
+    @app.get("/error")
+    async def raise_error() -> None:
+        raise error
+
+    request = ParsedRequest(
+        headers={},
+        path="/error",
+        method=Method.GET,
+        params={},
+        body={},
+        provider_data={},
+    )
+    assert await app.run(request) == expected
@@ -0,0 +1,125 @@
+import asyncio
+import functools
+import os
+import threading
+
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.app import LambdaAPI, Response
+from lambda_api.executors import Executor
+from lambda_api.schema import Method
+from tests.tools.events import make_request
+
+
+class Numbers(BaseModel):
+    values: list[int]
+
+
+NUMBERS = {"values": [1, 2, 3]}
+
+
+def sum_squares(body: Numbers) -> dict:
+    return {"sum": sum(value * value for value in body.values), "pid": os.getpid()}
+
+
+async def async_sum_squares(body: Numbers) -> dict:
+    return sum_squares(body)
+
+
+@pytest.fixture
+def app():
+    app = LambdaAPI(thread_workers=2, process_workers=1)
+    app.post("/process", executor=Executor.PROCESS)(sum_squares)
+    app.post("/process-async", executor="process")(async_sum_squares)
+
+    @app.post("/sync")
+    def sync_handler(body: Numbers) -> str:
+        return threading.current_thread().name
+
+    @app.post("/inline", executor=Executor.INLINE)
+    def inline_handler(body: Numbers) -> str:
+        return threading.current_thread().name
+
+    @app.post("/async-thread", executor=Executor.THREAD)
+    async def async_thread_handler(body: Numbers) -> str:
+        await asyncio.sleep(0)
+        return threading.current_thread().name
+
+    yield app
+    app.executors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sync_handler_runs_in_thread_pool(app: LambdaAPI):
+    assert app.executors.thread_pool is None
+
+    response = await app.run(make_request("/sync", Method.POST, body=NUMBERS))
+
+    assert response.status == 200
+    assert response.body.startswith(b'"lambda-api')
+    assert app.executors.thread_pool is not None
+    assert app.executors.process_pool is None
+
+
+@pytest.mark.asyncio
+async def test_inline_sync_handler(app: LambdaAPI):
+    response = await app.run(make_request("/inline", Method.POST, body=NUMBERS))
+
+    assert response == Response(
+        200, f'"{threading.current_thread().name}"'.encode(), raw=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_handler_in_thread_pool(app: LambdaAPI):
+    response = await app.run(make_request("/async-thread", Method.POST, body=NUMBERS))
+
+    assert response.body.startswith(b'"lambda-api')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/process", "/process-async"])
+async def test_handler_in_process_pool(app: LambdaAPI, path: str):
+    pool_responses = await asyncio.gather(
+        *(app.run(make_request(path, Method.POST, body=NUMBERS)) for _ in range(2))
+    )
+
+    for response in pool_responses:
+        assert response.status == 200
+        assert b'"sum":14' in response.body
+        assert f'"pid":{os.getpid()}'.encode() not in response.body
+
+
+def test_invalid_executor():
+    app = LambdaAPI()
+    app.post("/invalid", executor="gpu")(sum_squares)
+
+    with pytest.raises(ValueError):
+        app.compile()
+
+
+def log_calls(fn):
+    @functools.wraps(fn)
+    def wrapped(*args, **kwargs):
+        return fn(*args, **kwargs)
+
+    return wrapped
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor", [None, Executor.INLINE, Executor.THREAD])
+async def test_wrapped_async_handler(executor: Executor | None):
+    app = LambdaAPI()
+    config = {"executor": executor} if executor else {}
+
+    @app.post("/wrapped", **config)
+    @log_calls
+    async def wrapped_handler(body: Numbers) -> int:
+        await asyncio.sleep(0)
+        return sum(body.values)
+
+    response = await app.run(make_request("/wrapped", Method.POST, body=NUMBERS))
+    app.executors.shutdown()
+
+    assert response == Response(200, b"6", raw=True)
@@ -0,0 +1,153 @@
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.adapters import ALBAdapter, HTTPApiV2Adapter
+from lambda_api.app import LambdaAPI
+from lambda_api.schema import BearerAuthRequest, Headers, Method, Request
+from lambda_api.utils import LazyQueryParams, json_loads
+
+
+class SearchParams(BaseModel):
+    q: str
+    page: int = 1
+
+
+class SearchBody(BaseModel):
+    filters: list[str]
+
+
+class CookieHeaders(Headers):
+    cookie: str = ""
+
+
+class CookieRequest(Request):
+    headers: CookieHeaders  # type: ignore
+
+
+@pytest.fixture
+def app():
+    app = LambdaAPI()
+
+    @app.post("/search")
+    async def search(params: SearchParams, body: SearchBody) -> dict:
+        return {"q": params.q, "page": params.page, "filters": body.filters}
+
+    @app.get("/cookies")
+    async def get_cookies(request: CookieRequest) -> str:
+        return request.headers.cookie
+
+    @app.get("/request")
+    async def get_request(request: BearerAuthRequest) -> str:
+        return request.model_dump_json(include={"method", "path", "params"})
+
+    return app
+
+
+def make_v2_event(method: str, path: str, query: str = "", **extra):
+    return {
+        "version": "2.0",
+        "rawPath": path,
+        "rawQueryString": query,
+        "requestContext": {"http": {"method": method, "path": path}},
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_http_api_v2_adapter(app: LambdaAPI):
+    adapter = HTTPApiV2Adapter(app)
+    event = make_v2_event(
+        "POST",
+        "/search/",
+        "q=hello%20world&page=1&page=2",
+        body='{"filters": ["a"]}',
+    )
+
+    request = adapter.parse_request(event)
+    assert request.method == Method.POST
+    assert request.path == "/search"
+    assert isinstance(request.params, LazyQueryParams)
+    assert request.params._data is None
+
+    assert await adapter.run(event) == {
+        "statusCode": 200,
+        "body": '{"q":"hello world","page":2,"filters":["a"]}',
+        "headers": {"Content-Type": "application/json"},
+        "isBase64Encoded": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_http_api_v2_adapter_cookies_and_base64(app: LambdaAPI):
+    adapter = HTTPApiV2Adapter(app)
+
+    response = await adapter.run(
+        make_v2_event("GET", "/cookies", cookies=["a=1", "b=2"])
+    )
+    assert response["body"] == '"a=1; b=2"'
+
+    response = await adapter.run(
+        make_v2_event(
+            "POST",
+            "/search",
+            "q=x",
+            body="eyJmaWx0ZXJzIjogW119",  # {"filters": []}
+            isBase64Encoded=True,
+        )
+    )
+    assert response["body"] == '{"q":"x","page":1,"filters":[]}'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("multi_value", [False, True])
+async def test_alb_adapter(app: LambdaAPI, multi_value: bool):
+    adapter = ALBAdapter(app, multi_value_headers=multi_value)
+    event = {
+        "httpMethod": "POST",
+        "path": "/search",
+        "body": '{"filters": ["a", "b"]}',
+        "isBase64Encoded": False,
+    }
+    if multi_value:
+        event["multiValueQueryStringParameters"] = {"q": ["a%2Bb+c"], "page": ["3"]}
+        event["multiValueHeaders"] = {"Cookie": ["a=1"]}
+    else:
+        event["queryStringParameters"] = {"q": "a%2Bb+c", "page": "3"}
+        event["headers"] = {"cookie": "a=1"}
+
+    response = await adapter.run(event)
+
+    assert response["statusCode"] == 200
+    assert response["statusDescription"] == "200 OK"
+    assert response["body"] == '{"q":"a+b c","page":3,"filters":["a","b"]}'
+    if multi_value:
+        assert response["multiValueHeaders"] == {"Content-Type": ["application/json"]}
+    else:
+        assert response["headers"] == {"Content-Type": "application/json"}
+
+    event["path"] = "/missing"
+    response = await adapter.run(event)
+    assert response["statusDescription"] == "404 Not Found"
+
+
+@pytest.mark.asyncio
+async def test_request_model_with_lazy_params(app: LambdaAPI):
+    response = await HTTPApiV2Adapter(app).run(
+        make_v2_event("GET", "/request", "q=a%20b&page=2")
+    )
+    assert response["statusCode"] == 200
+    assert json_loads(json_loads(response["body"])) == {
+        "method": "GET",
+        "path": "/request",
+        "params": {"q": "a b", "page": "2"},
+    }
+
+    response = await ALBAdapter(app).run(
+        {
+            "httpMethod": "GET",
+            "path": "/request",
+            "queryStringParameters": {"q": "a%2Bb"},
+        }
+    )
+    assert response["statusCode"] == 200
+    assert json_loads(json_loads(response["body"]))["params"] == {"q": "a+b"}
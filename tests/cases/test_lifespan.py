@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from lambda_api.adapters import ASGIAdapter, AWSAdapter, SQSAdapter, get_event_loop
+from lambda_api.app import LambdaAPI
+from lambda_api.depends import Depends
+from tests.tools.events import make_event
+
+
+class Pool:
+    def __init__(self):
+        self.open = False
+
+
+def make_app(calls: list[str]):
+    app = LambdaAPI()
+    pool = Pool()
+
+    @app.on_startup
+    async def open_pool():
+        calls.append("startup")
+        pool.open = True
+
+    @app.on_startup
+    def warm_up():
+        calls.append("warm up")
+
+    @app.on_shutdown
+    async def close_pool():
+        calls.append("shutdown")
+        pool.open = False
+
+    @app.post("/pool")
+    async def get_pool(pool: Pool = Depends(lambda: pool, "container")) -> bool:
+        return pool.open
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_startup_runs_once():
+    calls: list[str] = []
+    adapter = AWSAdapter(make_app(calls))
+
+    for _ in range(3):
+        response = await adapter.run(make_event("/pool", "POST"))
+        assert (response["statusCode"], response["body"]) == (200, "true")
+
+    assert calls == ["startup", "warm up"]
+
+
+@pytest.mark.asyncio
+async def test_sqs_startup():
+    calls: list[str] = []
+    adapter = SQSAdapter(make_app(calls))
+
+    await adapter.run({"Records": []})
+
+    assert calls == ["startup", "warm up"]
+
+
+def test_eager_startup():
+    calls: list[str] = []
+    adapter = AWSAdapter(make_app(calls))
+
+    adapter.run_startup()
+
+    assert calls == ["startup", "warm up"]
+    assert adapter.app.started
+
+
+@pytest.mark.asyncio
+async def test_asgi_lifespan_hooks():
+    calls: list[str] = []
+    app = make_app(calls)
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await ASGIAdapter(app)({"type": "lifespan"}, receive, send)
+
+    assert calls == ["startup", "warm up", "shutdown"]
+    assert [message["type"] for message in sent] == [
+        "lifespan.startup.complete",
+        "lifespan.shutdown.complete",
+    ]
+    assert not app.started
+
+
+@pytest.mark.asyncio
+async def test_asgi_startup_failure():
+    app = LambdaAPI()
+
+    @app.on_startup
+    def fail():
+        raise RuntimeError("no database")
+
+    sent = []
+
+    async def receive():
+        return {"type": "lifespan.startup"}
+
+    async def send(message):
+        sent.append(message)
+
+    await ASGIAdapter(app)({"type": "lifespan"}, receive, send)
+
+    assert sent == [{"type": "lifespan.startup.failed", "message": "no database"}]
+    assert not app.started
+
+
+@pytest.mark.asyncio
+async def test_failed_shutdown_hook():
+    calls: list[str] = []
+    app = make_app(calls)
+
+    @app.on_shutdown
+    def fail():
+        raise RuntimeError("already closed")
+
+    await app.startup()
+    await app.shutdown()
+
+    assert calls == ["startup", "warm up", "shutdown"]
+
+
+def test_sync_handler_reuses_event_loop():
+    app = LambdaAPI()
+    loops = []
+
+    @app.on_startup
+    async def remember_loop():
+        loops.append(asyncio.get_running_loop())
+
+    @app.post("/loop")
+    async def get_loop() -> bool:
+        loops.append(asyncio.get_running_loop())
+        return True
+
+    adapter = AWSAdapter(app)
+    adapter.run_startup()
+    event = {"httpMethod": "POST", "pathParameters": {"proxy": "/loop"}}
+    responses = [adapter.handler(event), adapter.handler(event, None)]
+
+    assert [response["statusCode"] for response in responses] == [200, 200]
+    assert len(loops) == 3
+    assert loops[0] is loops[1] is loops[2] is get_event_loop()
+    assert SQSAdapter(app).handler({"Records": []}) == {"batchItemFailures": []}
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.app import LambdaAPI
+from lambda_api.limits import RateLimit, RateLimiter, by_header, by_source_ip
+from lambda_api.schema import Method
+from tests.tools.events import make_request
+
+
+class Item(BaseModel):
+    name: str
+
+
+@pytest.mark.asyncio
+async def test_route_rate_limit():
+    app = LambdaAPI()
+    calls = []
+
+    @app.post("/limited", rate_limit=RateLimit(rate=0.001, burst=2))
+    async def limited(body: Item) -> None:
+        calls.append(body)
+
+    statuses = [
+        (await app.run(make_request("/limited", Method.POST))).status for _ in range(3)
+    ]
+
+    # the rejected request isn't validated, the allowed ones fail the validation
+    assert statuses == [400, 400, 429]
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_by_key():
+    app = LambdaAPI()
+
+    @app.post("/limited", rate_limit=RateLimit(rate=0.001, key=by_header("X-Api-Key")))
+    async def limited() -> None: ...
+
+    async def status(key: str) -> int:
+        return (
+            await app.run(make_request("/limited", Method.POST, {"x_api_key": key}))
+        ).status
+
+    assert [await status("a"), await status("b"), await status("a")] == [200, 200, 429]
+
+
+def test_rate_limiter_refill_and_eviction(monkeypatch: pytest.MonkeyPatch):
+    now = 0.0
+    monkeypatch.setattr("lambda_api.limits.monotonic", lambda: now)
+    limiter = RateLimiter(RateLimit(rate=2, key=lambda request: request, max_keys=2))
+
+    assert [limiter.acquire("a") for _ in range(3)] == [True, True, False]
+    now = 0.5
+    assert [limiter.acquire("a") for _ in range(2)] == [True, False]
+
+    limiter.acquire("b")
+    limiter.acquire("c")
+    assert list(limiter.buckets) == ["b", "c"]
+    # the evicted key starts with the full bucket
+    assert [limiter.acquire("a") for _ in range(3)] == [True, True, False]
+
+
+@pytest.mark.parametrize(
+    "provider_data, headers",
+    [
+        ({"requestContext": {"identity": {"sourceIp": "1.2.3.4"}}}, {}),
+        ({"requestContext": {"http": {"sourceIp": "1.2.3.4"}}}, {}),
+        ({"client": ("1.2.3.4", 5000)}, {}),
+        ({}, {"x_forwarded_for": "1.2.3.4, 10.0.0.1"}),
+    ],
+)
+def test_by_source_ip(provider_data: dict, headers: dict):
+    assert (
+        by_source_ip(make_request(headers=headers, provider_data=provider_data))
+        == "1.2.3.4"
+    )
+
+
+@pytest.mark.asyncio
+async def test_max_concurrent_requests():
+    app = LambdaAPI(max_concurrent_requests=2)
+
+    @app.post("/slow")
+    async def slow() -> None:
+        await asyncio.sleep(0.01)
+
+    responses = await asyncio.gather(
+        *(app.run(make_request("/slow", Method.POST)) for _ in range(3))
+    )
+
+    assert [response.status for response in responses] == [200, 200, 503]
+    assert app.concurrent_requests == 0
+    assert (await app.run(make_request("/slow", Method.POST))).status == 200
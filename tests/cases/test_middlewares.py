@@ -0,0 +1,95 @@
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.app import CompileMode, LambdaAPI, ParsedRequest, Response
+from lambda_api.error import UnauthorizedError
+from lambda_api.router import Router
+from lambda_api.schema import Method
+from tests.tools.events import make_request
+
+
+class Item(BaseModel):
+    name: str
+
+
+def make_middleware(name: str, calls: list[str]):
+    async def middleware(request: ParsedRequest, call_next) -> Response:
+        calls.append(name)
+        response = await call_next(request)
+        response.headers = {**response.headers, f"X-{name}": "1"}
+        return response
+
+    return middleware
+
+
+@pytest.mark.asyncio
+async def test_middlewares_order():
+    calls: list[str] = []
+    app = LambdaAPI(middlewares=[make_middleware("app", calls)])
+
+    outer = Router(middlewares=[make_middleware("outer", calls)])
+    inner = Router()
+    inner.add_middleware(make_middleware("inner", calls))
+
+    @inner.post("/item", middlewares=[make_middleware("route", calls)])
+    async def post_item(body: Item) -> Item:
+        calls.append("handler")
+        return body
+
+    outer.add_router("/inner", inner)
+    app.add_router("/outer", outer)
+
+    response = await app.run(
+        make_request("/outer/inner/item", Method.POST, body={"name": "test"})
+    )
+
+    assert response.status == 200
+    assert calls == ["app", "outer", "inner", "route", "handler"]
+    assert set(response.headers) == {"X-app", "X-outer", "X-inner", "X-route"}
+
+
+@pytest.mark.asyncio
+async def test_middleware_short_circuit():
+    app = LambdaAPI()
+
+    @app.add_middleware
+    async def auth(request: ParsedRequest, call_next) -> Response:
+        if request.headers.get("authorization") != "secret":
+            raise UnauthorizedError()
+        return await call_next(request)
+
+    @app.post("/item")
+    async def post_item(body: Item) -> Item:
+        return body
+
+    # rejected before the body is validated
+    response = await app.run(make_request("/item", Method.POST))
+    assert response == Response(status=401, body={"error": "Unauthorized"})
+
+    request = make_request("/item", Method.POST, body={"name": "test"})
+    request.headers = {"authorization": "secret"}
+    response = await app.run(request)
+    assert response == Response(status=200, body=b'{"name":"test"}', raw=True)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_composed_once():
+    app = LambdaAPI(compile_mode=CompileMode.INIT)
+
+    @app.post("/item")
+    async def post_item(body: Item) -> Item:
+        return body
+
+    route = app.route_table["/item"][Method.POST]
+    pipeline = route.pipeline
+    assert pipeline is not None
+
+    await app.run(make_request("/item", Method.POST, body={"name": "test"}))
+    assert route.pipeline is pipeline
+
+    calls: list[str] = []
+    app.add_middleware(make_middleware("late", calls))
+    assert route.pipeline is None
+
+    await app.run(make_request("/item", Method.POST, body={"name": "test"}))
+    assert calls == ["late"]
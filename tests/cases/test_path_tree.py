@@ -0,0 +1,148 @@
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.app import LambdaAPI, Response
+from lambda_api.docsgen import OpenApiGenerator
+from lambda_api.path_tree import PathTree
+from tests.tools.events import make_request
+
+
+@pytest.fixture
+def tree():
+    tree = PathTree()
+    tree.insert("/users/{id:int}", "user")
+    tree.insert("/users/me", "me")
+    tree.insert("/users/{id:int}/posts", "user_posts")
+    tree.insert("/users/{id:int}/posts/{slug}", "user_post")
+    tree.insert("/files/{rest:path}", "files")
+    tree.insert("/files/public/readme", "readme")
+    return tree
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/users/42", ("user", {"id": 42})),
+        ("/users/me", ("me", {})),
+        ("/users/42/posts", ("user_posts", {"id": 42})),
+        ("/users/42/posts/hello", ("user_post", {"id": 42, "slug": "hello"})),
+        ("/files/a/b/c.txt", ("files", {"rest": "a/b/c.txt"})),
+        ("/files/public/readme", ("readme", {})),
+        ("/files/public/other", ("files", {"rest": "public/other"})),
+        ("/users/abc", None),
+        ("/users/42/comments", None),
+        ("/users", None),
+        ("/files", None),
+    ],
+)
+def test_path_tree_lookup(tree: PathTree, path: str, expected):
+    assert tree.lookup(path) == expected
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "/users/{user_id:int}/comments",
+        "/users/{id}/comments",
+        "/users/{id:int}",
+        "/files/{other:path}",
+        "/a/{x}/{x}",
+        "/a/{rest:path}/b",
+        "/a/{x:float}",
+        "/a/prefix-{x}",
+    ],
+)
+def test_path_tree_conflicts(tree: PathTree, template: str):
+    with pytest.raises(ValueError):
+        tree.insert(template, "conflict")
+
+
+class UserPath(BaseModel):
+    id: int
+
+
+class PostPath(BaseModel):
+    id: int
+    slug: str
+
+
+@pytest.fixture
+def app():
+    app = LambdaAPI(prefix="/api")
+
+    @app.get("/users/me")
+    async def get_me() -> str:
+        return "me"
+
+    @app.get("/users/{id:int}")
+    async def get_user(path: UserPath) -> int:
+        return path.id
+
+    @app.get("/users/{id:int}/posts/{slug}/")
+    async def get_post(path: PostPath) -> str:
+        return f"{path.id}:{path.slug}"
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_path_params_routing(app: LambdaAPI):
+    assert await app.run(make_request("/users/me")) == Response(200, b'"me"', raw=True)
+    assert await app.run(make_request("/users/7")) == Response(200, b"7", raw=True)
+    assert await app.run(make_request("/users/7/posts/hi")) == Response(
+        200, b'"7:hi"', raw=True
+    )
+    assert (await app.run(make_request("/users/x"))).status == 404
+    # the templates are matched by the path tree only, not as the literal paths
+    assert (await app.run(make_request("/users/{id:int}"))).status == 404
+
+
+def test_path_params_docsgen(app: LambdaAPI):
+    schema = OpenApiGenerator(app).get_schema()
+
+    assert "/api/users/{id}/posts/{slug}" in schema["paths"]
+    parameters = schema["paths"]["/api/users/{id}"]["get"]["parameters"]
+    assert parameters == [
+        {
+            "in": "path",
+            "name": "id",
+            "required": True,
+            "schema": {"title": "Id", "type": "integer"},
+        }
+    ]
+
+
+class OtherPath(BaseModel):
+    a: int
+
+
+class OptionalPath(BaseModel):
+    id: int
+    extra: str = ""
+
+
+@pytest.mark.parametrize(
+    "path, model",
+    [
+        ("/u/{id:int}", OtherPath),
+        ("/u/{id:int}/{slug}", UserPath),
+        ("/u", UserPath),
+    ],
+)
+def test_path_model_mismatch(path: str, model: type[BaseModel]):
+    app = LambdaAPI()
+
+    async def handler(path: model) -> None: ...  # type: ignore
+
+    with pytest.raises(ValueError):
+        app.get(path)(handler)
+    assert app.route_table == {}
+
+
+def test_path_model_with_optional_fields():
+    app = LambdaAPI()
+
+    @app.get("/u/{id:int}")
+    async def handler(path: OptionalPath) -> None: ...
+
+    assert "/u/{id:int}" in app.route_table
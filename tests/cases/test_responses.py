@@ -1,8 +1,14 @@
 import pytest
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError, model_validator
 
 from lambda_api.app import LambdaAPI, ParsedRequest, Response
-from lambda_api.schema import BearerAuthRequest, Headers, Method, Request
+from lambda_api.schema import (
+    BearerAuthRequest,
+    Headers,
+    Method,
+    Request,
+    make_request_loader,
+)
 
 
 class ExampleSchema(BaseModel):
@@ -71,7 +77,7 @@ async def test_responses(app: LambdaAPI):
             body={},
             provider_data={},
         )
-    ) == Response(status=200, body="empty")
+    ) == Response(status=200, body=b'"empty"', raw=True)
 
     assert await app.run(
         ParsedRequest(
@@ -82,7 +88,7 @@ async def test_responses(app: LambdaAPI):
             body={},
             provider_data={},
         )
-    ) == Response(status=200, body="root")
+    ) == Response(status=200, body=b'"root"', raw=True)
 
     assert await app.run(
         ParsedRequest(
@@ -93,7 +99,7 @@ async def test_responses(app: LambdaAPI):
             body={},
             provider_data={},
         )
-    ) == Response(status=200, body="test name")
+    ) == Response(status=200, body=b'"test name"', raw=True)
 
     assert await app.run(
         ParsedRequest(
@@ -104,7 +110,7 @@ async def test_responses(app: LambdaAPI):
             body={},
             provider_data={},
         )
-    ) == Response(status=200, body={"message": "test name"})
+    ) == Response(status=200, body=b'{"message":"test name"}', raw=True)
 
     assert await app.run(
         ParsedRequest(
@@ -115,7 +121,7 @@ async def test_responses(app: LambdaAPI):
             body={},
             provider_data={},
         )
-    ) == Response(status=200, body="test header")
+    ) == Response(status=200, body=b'"test header"', raw=True)
 
     assert await app.run(
         ParsedRequest(
@@ -126,4 +132,59 @@ async def test_responses(app: LambdaAPI):
             body={},
             provider_data={},
         )
-    ) == Response(status=200, body="test header")
+    ) == Response(status=200, body=b'"test header"', raw=True)
+
+
+class CustomHeaders(Headers):
+    x_custom_header: int
+
+
+class CustomRequest(Request):
+    headers: CustomHeaders  # type: ignore
+
+
+class ValidatedRequest(CustomRequest):
+    @model_validator(mode="after")
+    def check_path(self):
+        assert self.path == "/example"
+        return self
+
+
+@pytest.mark.parametrize(
+    "request_cls, fully_validated",
+    [
+        (Request, False),
+        (BearerAuthRequest, False),
+        (CustomRequest, False),
+        (ValidatedRequest, True),
+    ],
+)
+def test_request_loader(request_cls: type[Request], fully_validated: bool):
+    provider_data = {"requestContext": {"stage": "prod"}}
+    parsed = ParsedRequest(
+        headers={"x_custom_header": "42", "authorization": "Bearer token"},
+        path="/example",
+        method=Method.GET,
+        params={"name": "test name"},
+        body={},
+        provider_data=provider_data,
+    )
+
+    request = make_request_loader(request_cls)(parsed)
+
+    assert isinstance(request, request_cls)
+    assert request.method == Method.GET
+    assert request.params == {"name": "test name"}
+    assert getattr(request.headers, "authorization") == "Bearer token"
+    assert request.provider_data is provider_data
+    assert (make_request_loader(request_cls) == request_cls.model_validate) == (
+        fully_validated
+    )
+    assert request == request_cls.model_validate(parsed)
+
+    if issubclass(request_cls, CustomRequest):
+        assert request.headers.x_custom_header == 42
+
+        with pytest.raises(ValidationError):
+            parsed.headers = {}
+            make_request_loader(request_cls)(parsed)
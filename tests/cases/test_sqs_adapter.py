@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.adapters import SQSAdapter
+from lambda_api.app import LambdaAPI
+from lambda_api.utils import json_dumps
+
+
+class OrderBody(BaseModel):
+    id: int
+    fail: bool = False
+
+
+@pytest.fixture
+def app():
+    app = LambdaAPI()
+    app.processed = []
+    app.in_flight = 0
+    app.max_in_flight = 0
+
+    @app.post("/orders")
+    async def process_order(body: OrderBody) -> None:
+        app.in_flight += 1
+        app.max_in_flight = max(app.max_in_flight, app.in_flight)
+        await asyncio.sleep(0.01)
+        app.in_flight -= 1
+
+        if body.fail:
+            raise ValueError("Failed order")
+        app.processed.append(body.id)
+
+    return app
+
+
+def make_record(message_id: str, body: dict, group_id: str | None = None, **attrs):
+    record = {
+        "messageId": message_id,
+        "body": json_dumps(body),
+        "attributes": {"MessageGroupId": group_id} if group_id else {},
+        "messageAttributes": {
+            k: {"stringValue": v, "dataType": "String"} for k, v in attrs.items()
+        },
+    }
+    return record
+
+
+@pytest.mark.asyncio
+async def test_sqs_concurrent_processing(app: LambdaAPI):
+    adapter = SQSAdapter(app, concurrency=3)
+    records = [make_record(str(i), {"id": i}, route="/orders") for i in range(10)]
+
+    assert await adapter.run({"Records": records}) == {"batchItemFailures": []}
+    assert sorted(app.processed) == list(range(10))
+    assert app.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_sqs_partial_batch_failures(app: LambdaAPI):
+    adapter = SQSAdapter(app, route_field="type")
+    records = [
+        make_record("ok", {"type": "/orders", "id": 1}),
+        make_record("failed", {"type": "/orders", "id": 2, "fail": True}),
+        make_record("invalid", {"type": "/orders"}),
+        make_record("unknown", {"type": "/unknown", "id": 3}),
+        {"messageId": "broken", "body": "{"},
+    ]
+
+    result = await adapter.run({"Records": records})
+
+    assert result["batchItemFailures"] == [
+        {"itemIdentifier": "failed"},
+        {"itemIdentifier": "invalid"},
+        {"itemIdentifier": "unknown"},
+        {"itemIdentifier": "broken"},
+    ]
+    assert app.processed == [1]
+
+
+@pytest.mark.asyncio
+async def test_sqs_fifo_groups(app: LambdaAPI):
+    adapter = SQSAdapter(app)
+    records = [
+        make_record("a1", {"id": 1}, "a", route="/orders"),
+        make_record("b1", {"id": 10}, "b", route="/orders"),
+        make_record("a2", {"id": 2, "fail": True}, "a", route="/orders"),
+        make_record("b2", {"id": 11}, "b", route="/orders"),
+        make_record("a3", {"id": 3}, "a", route="/orders"),
+    ]
+
+    result = await adapter.run({"Records": records})
+
+    assert result["batchItemFailures"] == [
+        {"itemIdentifier": "a2"},
+        {"itemIdentifier": "a3"},
+    ]
+    assert [i for i in app.processed if i < 10] == [1]
+    assert [i for i in app.processed if i >= 10] == [10, 11]
+    assert app.max_in_flight == 2
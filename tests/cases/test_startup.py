@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+import lambda_api
+from lambda_api.startup_report import ImportTime, parse_importtime
+
+
+def test_lazy_exports():
+    from lambda_api.app import LambdaAPI
+
+    assert lambda_api.LambdaAPI is LambdaAPI
+    assert "AWSAdapter" in dir(lambda_api)
+
+    with pytest.raises(AttributeError):
+        lambda_api.Missing
+
+
+def test_heavy_modules_not_imported():
+    code = (
+        "import sys; from lambda_api import AWSAdapter;"
+        "print('lambda_api.docsgen' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "False"
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       105 |        105 |   lambda_api\n"
+        "import time:      8840 |     111489 |   lambda_api.app\n"
+    )
+
+    assert parse_importtime(output) == [
+        ImportTime("lambda_api", 105, 105),
+        ImportTime("lambda_api.app", 8840, 111489),
+    ]
@@ -0,0 +1,243 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.adapters import ASGIAdapter, AWSAdapter, HTTPApiV2Adapter
+from lambda_api.app import LambdaAPI
+from lambda_api.docsgen import OpenApiGenerator
+from lambda_api.streaming import BoundedStream, LocalResponseStream, StreamFormat
+from lambda_api.utils import json_loads
+from tests.tools.events import make_event
+
+
+class Item(BaseModel):
+    id: int
+
+
+class ExportParams(BaseModel):
+    count: int = 3
+    fail_at: int | None = None
+
+
+@pytest.fixture
+def app():
+    app = LambdaAPI()
+
+    async def items(params: ExportParams):
+        for i in range(params.count):
+            if i == params.fail_at:
+                yield {"id": "invalid"}
+            yield {"id": i}
+
+    @app.get("/export")
+    async def export(params: ExportParams) -> AsyncIterator[Item]:
+        async for item in items(params):
+            yield item
+
+    @app.get("/export.json", stream=StreamFormat.JSON)
+    async def export_json(params: ExportParams) -> AsyncIterator[int]:
+        async for item in items(params):
+            yield item["id"]
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_buffered_stream(app: LambdaAPI):
+    response = await AWSAdapter(app).run(make_event("/export"))
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Type"] == "application/x-ndjson"
+    assert response["body"] == '{"id":0}\n{"id":1}\n{"id":2}\n'
+
+    response = await AWSAdapter(app).run(make_event("/export.json"))
+    assert response["headers"]["Content-Type"] == "application/json"
+    assert response["body"] == "[0,1,2]"
+
+    response = await AWSAdapter(app).run(
+        make_event("/export.json", params={"count": 0})
+    )
+    assert response["body"] == "[]"
+
+
+@pytest.mark.asyncio
+async def test_buffered_stream_failure(app: LambdaAPI):
+    response = await AWSAdapter(app).run(make_event("/export", params={"fail_at": 1}))
+
+    assert response["statusCode"] == 500
+
+
+@pytest.mark.asyncio
+async def test_lambda_response_streaming(app: LambdaAPI):
+    event = {
+        "rawPath": "/export",
+        "rawQueryString": "count=2",
+        "requestContext": {"http": {"method": "GET"}},
+    }
+    stream = LocalResponseStream()
+
+    await HTTPApiV2Adapter(app).run_streaming(event, None, stream)
+
+    prelude, body = stream.read()
+    assert prelude == {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/x-ndjson"},
+    }
+    assert body == b'{"id":0}\n{"id":1}\n'
+    assert stream.chunks[1:] == [b'{"id":0}\n', b'{"id":1}\n']
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_lambda_response_streaming_failure(app: LambdaAPI):
+    stream = LocalResponseStream()
+
+    await AWSAdapter(app).run_streaming(
+        make_event("/export", params={"fail_at": 1}), None, stream
+    )
+
+    prelude, body = stream.read()
+    assert prelude["statusCode"] == 200
+    assert body == b'{"id":0}\n'
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_lambda_response_streaming_plain_response(app: LambdaAPI):
+    stream = LocalResponseStream()
+
+    await AWSAdapter(app).run_streaming(make_event("/missing"), None, stream)
+
+    prelude, body = stream.read()
+    assert prelude["statusCode"] == 404
+    assert json_loads(body) == {"error": "Not Found"}
+
+
+@pytest.mark.asyncio
+async def test_asgi_streaming(app: LambdaAPI):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/export.json",
+        "query_string": b"count=2",
+        "headers": [],
+    }
+    await ASGIAdapter(app)(scope, receive, send)
+
+    assert sent[0]["headers"] == [(b"content-type", b"application/json")]
+    assert [message.get("body") for message in sent[1:]] == [b"[0", b",1", b"]", b""]
+    assert [message.get("more_body", False) for message in sent[1:]] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_timeout():
+    app = LambdaAPI()
+
+    @app.get("/slow", timeout=0.05)
+    async def slow() -> AsyncIterator[int]:
+        yield 1
+        await asyncio.sleep(1)
+        yield 2
+
+    response = await AWSAdapter(app).run(make_event("/slow"))
+    assert response["statusCode"] == 504
+
+    stream = LocalResponseStream()
+    await AWSAdapter(app).run_streaming(make_event("/slow"), None, stream)
+
+    prelude, body = stream.read()
+    assert prelude["statusCode"] == 200
+    assert body == b"1\n"
+    assert stream.closed
+    assert app.concurrent_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_concurrency_slot(app: LambdaAPI):
+    app.max_concurrent_requests = 1
+
+    response = await AWSAdapter(app).get_response(make_event("/export"), None)
+    assert app.concurrent_requests == 1
+    assert (await AWSAdapter(app).run(make_event("/export")))["statusCode"] == 503
+
+    assert [chunk async for chunk in response.stream] == [
+        b'{"id":0}\n',
+        b'{"id":1}\n',
+        b'{"id":2}\n',
+    ]
+    assert app.concurrent_requests == 0
+    assert (await AWSAdapter(app).run(make_event("/export")))["statusCode"] == 200
+
+
+class GoneResponseStream(LocalResponseStream):
+    async def write(self, data: bytes):
+        raise ConnectionError("The client is gone")
+
+
+@pytest.mark.asyncio
+async def test_stream_slot_freed_when_client_is_gone(app: LambdaAPI):
+    app.max_concurrent_requests = 1
+    stream = GoneResponseStream()
+
+    await AWSAdapter(app).run_streaming(make_event("/export"), None, stream)
+
+    assert stream.closed
+    assert app.concurrent_requests == 0
+    assert (await AWSAdapter(app).run(make_event("/export")))["statusCode"] == 200
+
+
+@pytest.mark.asyncio
+async def test_bounded_stream_closed_once():
+    closed = []
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b"a"
+
+    stream = BoundedStream(chunks(), None, lambda: closed.append(True))
+    await stream.aclose()
+    await stream.aclose()
+
+    assert closed == [True]
+    assert [chunk async for chunk in stream] == []
+
+
+def test_streaming_docs(app: LambdaAPI):
+    paths = OpenApiGenerator(app).get_schema()["paths"]
+
+    assert paths["/export"]["get"]["responses"]["200"]["content"] == {
+        "application/x-ndjson": {"schema": {"$ref": "#/components/schemas/Item"}}
+    }
+    assert paths["/export.json"]["get"]["responses"]["200"]["content"] == {
+        "application/json": {
+            "schema": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/RootModel[int]"},
+            }
+        }
+    }
+
+
+def test_streaming_handler_executor():
+    app = LambdaAPI()
+
+    @app.get("/export", executor="thread")
+    async def export() -> AsyncIterator[int]:
+        yield 1
+
+    with pytest.raises(ValueError):
+        app.compile()
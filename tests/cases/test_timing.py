@@ -0,0 +1,102 @@
+import pytest
+from pydantic import BaseModel
+
+from lambda_api.adapters import AWSAdapter
+from lambda_api.app import LambdaAPI, ParsedRequest, Response
+from lambda_api.schema import Method
+from tests.tools.events import make_event
+
+
+class Item(BaseModel):
+    name: str
+
+
+def make_app(**kwargs):
+    app = LambdaAPI(prefix="/api", **kwargs)
+
+    @app.post("/items")
+    async def post_item(body: Item) -> Item:
+        return body
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_timing_disabled_by_default():
+    app = make_app()
+    request = AWSAdapter(app).parse_request_timed(
+        make_event("/items", "POST", '{"name": "item"}')
+    )
+
+    await app.run(request)
+
+    assert not app.timing_enabled
+    assert request.timings is None
+
+
+@pytest.mark.asyncio
+async def test_timing_observer():
+    app = make_app()
+    calls: list[tuple[ParsedRequest, Response, dict[str, float]]] = []
+    app.add_observer(lambda *args: calls.append(args))
+
+    response = await AWSAdapter(app).run(
+        make_event("/items", "POST", '{"name": "item"}')
+    )
+
+    assert response["statusCode"] == 200
+    assert "Server-Timing" not in response["headers"]
+    [(request, result, timings)] = calls
+    assert result.status == 200
+    assert request.timings is timings
+    assert list(timings) == ["parse", "validate", "handler", "serialize", "total"]
+    assert all(duration >= 0 for duration in timings.values())
+
+
+@pytest.mark.asyncio
+async def test_timing_observer_failure_is_ignored():
+    app = make_app()
+
+    def observer(*args):
+        raise RuntimeError("observer failure")
+
+    app.add_observer(observer)
+    response = await AWSAdapter(app).run(
+        make_event("/items", "POST", '{"name": "item"}')
+    )
+
+    assert response["statusCode"] == 200
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header():
+    app = make_app(server_timing=True)
+
+    response = await AWSAdapter(app).run(
+        make_event("/items", "POST", '{"name": "item"}')
+    )
+
+    phases = [
+        entry.split(";dur=")[0]
+        for entry in response["headers"]["Server-Timing"].split(", ")
+    ]
+    assert phases == ["parse", "validate", "handler", "serialize", "total"]
+
+
+@pytest.mark.asyncio
+async def test_server_timing_on_error():
+    app = make_app(server_timing=True)
+
+    response = await app.run(
+        ParsedRequest(
+            headers={},
+            path="/items",
+            method=Method.POST,
+            params={},
+            body={},
+            provider_data={},
+        )
+    )
+
+    assert response.status == 400
+    assert response.headers["Server-Timing"].startswith("total;dur=")
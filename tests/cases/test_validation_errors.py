@@ -0,0 +1,161 @@
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from lambda_api.adapters import AWSAdapter, HTTPApiV2Adapter
+from lambda_api.app import LambdaAPI
+from lambda_api.schema import Headers, Method, Request
+from lambda_api.utils import json_loads
+from lambda_api.validation import ValidationErrorConfig, encode_validation_error
+from tests.tools.events import make_request
+
+
+class Item(BaseModel):
+    id: int
+
+
+class Body(BaseModel):
+    items: list[Item]
+
+
+def make_app(**kwargs):
+    app = LambdaAPI(**kwargs)
+
+    @app.post("/items")
+    async def post_items(body: Body) -> int:
+        return len(body.items)
+
+    @app.post("/inner")
+    async def inner_validation() -> None:
+        Item.model_validate({"id": "x"})
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_validation_error_response():
+    app = make_app()
+
+    response = await app.run(
+        make_request("/items", Method.POST, body={"items": [{"id": "x"}]})
+    )
+
+    assert response.status == 400
+    assert response.raw
+    assert json_loads(response.body) == {
+        "error": [
+            {
+                "type": "int_parsing",
+                "loc": ["items", 0, "id"],
+                "msg": "Input should be a valid integer, "
+                "unable to parse string as an integer",
+                "input": "x",
+            }
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_validation_error_paths_consistent():
+    app = make_app()
+
+    request = make_request("/items", Method.POST, body={})
+    request.path = "/inner"
+    inner = json_loads((await app.run(request)).body)
+    outer = json_loads(
+        (
+            await app.run(
+                make_request("/items", Method.POST, body={"items": [{"id": "x"}]})
+            )
+        ).body
+    )
+
+    assert inner["error"][0].keys() == outer["error"][0].keys()
+
+
+@pytest.mark.asyncio
+async def test_validation_error_bounded():
+    app = make_app(
+        validation_errors=ValidationErrorConfig(max_errors=3, include_input=False)
+    )
+
+    response = await app.run(
+        make_request("/items", Method.POST, body={"items": [{"id": "x"}] * 100})
+    )
+
+    body = json_loads(response.body)
+    assert body["error_count"] == 100
+    assert len(body["error"]) == 3
+    assert all("input" not in error for error in body["error"])
+
+
+def test_encode_validation_error_context():
+    class Positive(BaseModel):
+        value: int
+
+        def model_post_init(self, context):
+            if self.value < 0:
+                raise ValueError("negative")
+
+    with pytest.raises(ValidationError) as e:
+        Positive(value=-1)
+
+    [error] = json_loads(encode_validation_error(e.value, ValidationErrorConfig()))[
+        "error"
+    ]
+    assert error["ctx"] == {"error": "negative"}
+
+
+class AuthHeaders(Headers):
+    authorization: str
+
+
+class AuthRequest(Request):
+    headers: AuthHeaders  # type: ignore
+
+
+class SearchParams(BaseModel):
+    name: str
+
+
+@pytest.mark.asyncio
+async def test_missing_header_through_adapter():
+    app = LambdaAPI()
+
+    @app.get("/me")
+    async def get_me(request: AuthRequest) -> str:
+        return request.headers.authorization
+
+    response = await AWSAdapter(app).run(
+        {
+            "httpMethod": "GET",
+            "pathParameters": {"proxy": "/me"},
+            "headers": {"X-Other": "value"},
+        }
+    )
+
+    assert response["statusCode"] == 400
+    [error] = json_loads(response["body"])["error"]
+    assert error["loc"] == ["headers", "authorization"]
+    assert error["input"] == {"x_other": "value"}
+
+
+@pytest.mark.asyncio
+async def test_missing_query_param_through_adapter():
+    app = LambdaAPI()
+
+    @app.get("/search")
+    async def search(params: SearchParams) -> str:
+        return params.name
+
+    response = await HTTPApiV2Adapter(app).run(
+        {
+            "rawPath": "/search",
+            "rawQueryString": "other=1",
+            "requestContext": {"http": {"method": "GET"}},
+        }
+    )
+
+    assert response["statusCode"] == 400
+    [error] = json_loads(response["body"])["error"]
+    assert error["loc"] == ["name"]
+    assert error["input"] == {"other": "1"}
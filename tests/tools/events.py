@@ -0,0 +1,46 @@
+from typing import Any
+
+from lambda_api.app import ParsedRequest
+from lambda_api.schema import Method
+
+
+def make_request(
+    path: str = "/",
+    method: Method = Method.GET,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    body: Any = None,
+    provider_data: dict[str, Any] | None = None,
+) -> ParsedRequest:
+    """
+    Make the request as parsed by the adapters, with the normalized header names,
+    e.g. `x_api_key`.
+    """
+    return ParsedRequest(
+        headers=headers or {},
+        path=path,
+        method=method,
+        params=params or {},
+        body=body if body is not None else {},
+        provider_data=provider_data or {},
+    )
+
+
+def make_event(
+    path: str,
+    method: str = "GET",
+    body: str | None = None,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Make the API Gateway REST API proxy event of `AWSAdapter`.
+    """
+    event: dict[str, Any] = {"httpMethod": method, "pathParameters": {"proxy": path}}
+    if body is not None:
+        event["body"] = body
+    if headers:
+        event["headers"] = headers
+    if params:
+        event["queryStringParameters"] = {k: str(v) for k, v in params.items()}
+    return event